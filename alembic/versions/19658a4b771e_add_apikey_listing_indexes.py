@@ -0,0 +1,32 @@
+"""Add apikey listing indexes
+
+Revision ID: 19658a4b771e
+Revises: 7e9f22fdd572
+Create Date: 2026-10-18 03:23:05.389445
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '19658a4b771e'
+down_revision: Union[str, Sequence[str], None] = '7e9f22fdd572'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_apikeys_user_id_key_id', 'apikeys', ['user_id', 'key_id'], unique=False)
+    op.create_index('ix_apikeys_user_id_is_active_key_id', 'apikeys', ['user_id', 'is_active', 'key_id'], unique=False)
+    op.create_index('ix_apikeys_user_id_label_pattern', 'apikeys', ['user_id', 'label'], unique=False, postgresql_ops={'label': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_apikeys_user_id_label_pattern', table_name='apikeys')
+    op.drop_index('ix_apikeys_user_id_is_active_key_id', table_name='apikeys')
+    op.drop_index('ix_apikeys_user_id_key_id', table_name='apikeys')
@@ -0,0 +1,35 @@
+"""Add apikey key_digest
+
+Revision ID: 1eeac66dbca6
+Revises: 30b3a6790cff
+Create Date: 2026-10-18 02:52:02.798911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1eeac66dbca6'
+down_revision: Union[str, Sequence[str], None] = '30b3a6790cff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('apikeys', sa.Column('key_digest', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_apikeys_key_digest'), 'apikeys', ['key_digest'], unique=True)
+    # Argon2 hashes are dropped once a key is migrated to its digest
+    op.alter_column('apikeys', 'key', existing_type=sa.String(length=100), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Keys that only have a digest cannot be verified without it
+    op.execute("DELETE FROM apikeys WHERE key IS NULL")
+    op.alter_column('apikeys', 'key', existing_type=sa.String(length=100), nullable=False)
+    op.drop_index(op.f('ix_apikeys_key_digest'), table_name='apikeys')
+    op.drop_column('apikeys', 'key_digest')
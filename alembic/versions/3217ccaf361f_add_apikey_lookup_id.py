@@ -0,0 +1,30 @@
+"""Add apikey lookup_id
+
+Revision ID: 3217ccaf361f
+Revises: 1eeac66dbca6
+Create Date: 2026-10-18 02:54:12.074251
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3217ccaf361f'
+down_revision: Union[str, Sequence[str], None] = '1eeac66dbca6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('apikeys', sa.Column('lookup_id', sa.String(length=16), nullable=True))
+    op.create_index(op.f('ix_apikeys_lookup_id'), 'apikeys', ['lookup_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_apikeys_lookup_id'), table_name='apikeys')
+    op.drop_column('apikeys', 'lookup_id')
@@ -0,0 +1,30 @@
+"""Cascade apikey deletes with their user
+
+Revision ID: 44fa1b3b6fbf
+Revises: 19658a4b771e
+Create Date: 2026-10-18 03:50:30.346944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44fa1b3b6fbf'
+down_revision: Union[str, Sequence[str], None] = '19658a4b771e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('apikeys_user_id_fkey', 'apikeys', type_='foreignkey')
+    op.create_foreign_key('apikeys_user_id_fkey', 'apikeys', 'users', ['user_id'], ['user_id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('apikeys_user_id_fkey', 'apikeys', type_='foreignkey')
+    op.create_foreign_key('apikeys_user_id_fkey', 'apikeys', 'users', ['user_id'], ['user_id'])
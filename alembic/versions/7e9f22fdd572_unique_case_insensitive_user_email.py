@@ -0,0 +1,30 @@
+"""Unique case-insensitive user email
+
+Revision ID: 7e9f22fdd572
+Revises: b51d78ba66a1
+Create Date: 2026-10-18 03:18:23.498942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e9f22fdd572'
+down_revision: Union[str, Sequence[str], None] = 'b51d78ba66a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.create_index('uq_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_users_email_lower', table_name='users')
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=False)
@@ -0,0 +1,28 @@
+"""Add unique apikey label per user
+
+Revision ID: b51d78ba66a1
+Revises: e25dc0a91336
+Create Date: 2026-10-18 03:17:19.006052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b51d78ba66a1'
+down_revision: Union[str, Sequence[str], None] = 'e25dc0a91336'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_unique_constraint('uq_apikeys_user_id_label', 'apikeys', ['user_id', 'label'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_apikeys_user_id_label', 'apikeys', type_='unique')
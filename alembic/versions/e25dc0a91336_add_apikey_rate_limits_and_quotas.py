@@ -0,0 +1,34 @@
+"""Add apikey rate limits and quotas
+
+Revision ID: e25dc0a91336
+Revises: 3217ccaf361f
+Create Date: 2026-10-18 03:14:50.517375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e25dc0a91336'
+down_revision: Union[str, Sequence[str], None] = '3217ccaf361f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('apikeys', sa.Column('rate_limit_per_minute', sa.Integer(), nullable=True))
+    op.add_column('apikeys', sa.Column('daily_quota', sa.Integer(), nullable=True))
+    op.add_column('apikeys', sa.Column('quota_used', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('apikeys', sa.Column('quota_day', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('apikeys', 'quota_day')
+    op.drop_column('apikeys', 'quota_used')
+    op.drop_column('apikeys', 'daily_quota')
+    op.drop_column('apikeys', 'rate_limit_per_minute')
@@ -1,18 +1,26 @@
+import hmac
+import time
 from datetime import datetime, timezone
 
-from fastapi import Depends, Security, HTTPException, status
+from fastapi import Depends, Response, Security, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import jwt, JWTError
+from sqlalchemy.orm.attributes import set_committed_value
+from jose import JWTError
 
 from app.db.session import get_db
 from app.core.config import settings
+from app.core.cache import principal_cache, jwt_claims_cache, snapshot_columns
+from app.core.metrics import JWT_DECODE_DURATION
+from app.core.ratelimit import apikey_limiter
+from app.core.security import SecurityUtils
 
 from app.models.user import User 
 from app.models.apikey import APIKey
 
 from app.services.user_service import UserService 
 from app.services.api_service import APIService
+from app.services.usage_buffer import key_usage_buffer
 
 # Define the scheme so Swagger UI knows how to send the token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login/form")
@@ -35,8 +43,18 @@ async def get_current_user(
     )
 
     try:
-        # 1. Decode the token
-        payload = jwt.decode(token=token, key=settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        # 1. Decode the token, unless it was already validated with the current key
+        fingerprint = SecurityUtils.jwt_key_fingerprint()
+        payload = jwt_claims_cache.get_claims(token, fingerprint)
+
+        if payload is None:
+            start = time.perf_counter()
+            try:
+                payload = SecurityUtils.decode_access_token(token)
+            finally:
+                JWT_DECODE_DURATION.observe(time.perf_counter() - start)
+
+            jwt_claims_cache.add(token, payload, fingerprint)
 
         # 2. Get the Subject (User ID)
         user_id_str = payload.get("sub")
@@ -49,10 +67,19 @@ async def get_current_user(
     except (JWTError, ValueError): 
         raise credentials_exception 
 
+    # 4. Serve the user from the principal cache while it is current
+    snapshot = principal_cache.get_principal(user_id)
+
+    if snapshot is not None:
+        return User(**snapshot)
+
+    version = principal_cache.version(user_id)
     user = await user_service.get_by_user_id(db=db, user_id=user_id)
     
     if not user: 
         raise credentials_exception
+
+    principal_cache.add(user_id, version, snapshot_columns(user, exclude={"password"}))
     
     return user
 
@@ -61,6 +88,7 @@ apikey_header_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
 api_service = APIService()
 
 async def validate_apikey(
+        response: Response,
         key_sent: str = Security(apikey_header_scheme),
         db: AsyncSession = Depends(get_db)
     ) -> APIKey:
@@ -88,7 +116,33 @@ async def validate_apikey(
             detail="API Key is inactive/revoked.",  
         )
     
-    api_key_db.last_used_at = datetime.now(timezone.utc)
-    await db.commit()
+    # 4. Enforce the key's rate limit and daily quota (429 when exceeded)
+    used_at = datetime.now(timezone.utc)
+    response.headers.update(apikey_limiter.check(api_key_db, now=used_at))
+
+    # 5. Record usage; the buffer writes it behind without a transaction here
+    key_usage_buffer.record(api_key_db.key_id, used_at, quota_day=apikey_limiter.quota_day(api_key_db.key_id))
+    set_committed_value(api_key_db, "last_used_at", used_at)
+
+    return api_key_db
+
+
+admin_token_scheme = APIKeyHeader(name="X-Admin-Token", auto_error=False, scheme_name="AdminToken")
 
-    return api_key_db
\ No newline at end of file
+async def require_admin(token_sent: str = Security(admin_token_scheme)) -> None:
+    """
+    Dependency guarding the admin endpoints with the ADMIN_API_TOKEN setting.
+    """
+    # 1. Admin endpoints are off unless a token is configured
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled.",
+        )
+
+    # 2. Compare in constant time
+    if not token_sent or not hmac.compare_digest(token_sent.encode(), settings.ADMIN_API_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token.",
+        )
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.core.config import settings
+from app.api.deps import require_admin
+from app.services.export_service import ExportService
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+export_service = ExportService()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def _export_response(chunks, exported_at: datetime) -> StreamingResponse:
+    # Pass X-Export-Watermark as `since` on the next run to only get newer changes
+    return StreamingResponse(
+        chunks,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Export-Watermark": exported_at.isoformat()},
+    )
+
+# 1. Export users
+@router.get("/export/users")
+async def export_users(
+    since: Optional[datetime] = Query(None, description="Only rows created or updated at or after this time"),
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream every user (without password hashes) as NDJSON.
+    """
+    exported_at = datetime.now(timezone.utc)
+
+    return _export_response(export_service.stream_users(db=db, since=since, batch_size=batch_size), exported_at)
+
+# 2. Export API keys
+@router.get("/export/apikeys")
+async def export_apikeys(
+    since: Optional[datetime] = Query(None, description="Only rows created or updated at or after this time"),
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream every API key (without key material) as NDJSON.
+    """
+    exported_at = datetime.now(timezone.utc)
+
+    return _export_response(export_service.stream_apikeys(db=db, since=since, batch_size=batch_size), exported_at)
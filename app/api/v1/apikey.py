@@ -1,10 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
+from app.core.config import settings
+from app.core.responses import list_response
 from app.schemas.user import UserResponse
-from app.schemas.apikey import APIKeyCreate, APIKeyResponse, APIKeyUpdate, APIKeyInfo
+from app.schemas.apikey import APIKeyCreate, APIKeyResponse, APIKeyUpdate, APIKeyInfo, APIKEY_INFO_LIST, APIKeyBulkSelector, APIKeyBulkResult
 from app.services.api_service import APIService
 from app.api.deps import get_current_user, validate_apikey
 
@@ -32,32 +34,61 @@ async def create_apikey(
         db=db, 
     )
 
-# 2. Get all API Keys
+# 2. Create API Keys in bulk
+@router.post("/bulk-create", response_model=List[APIKeyResponse], status_code=status.HTTP_201_CREATED)
+async def create_apikeys(
+    keys_data: List[APIKeyCreate],
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create several API keys at once. The plaintext keys are only shown in this response.
+    """
+    real_user_id = current_user.user_id
+
+    keys_data_list = [key_data.model_dump(exclude_unset=True) for key_data in keys_data]
+
+    return await api_service.create_apikeys(
+        user_id=real_user_id,
+        keys_data=keys_data_list,
+        db=db,
+    )
+
+# 3. Get API Keys, one page at a time
 @router.get("/", response_model=List[APIKeyInfo], status_code=status.HTTP_200_OK)
 async def read_apikey(
+    response: Response,
+    limit: int = Query(settings.APIKEY_PAGE_SIZE, ge=1, le=settings.APIKEY_PAGE_MAX),
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor of the previous page"),
+    is_active: Optional[bool] = None,
+    label_prefix: Optional[str] = Query(None, min_length=1, max_length=50),
     current_user: UserResponse = Depends(get_current_user), 
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve all API keys belonging to the current user.
+    Retrieve the API keys belonging to the current user, ordered by key_id.
+    When more keys follow, the X-Next-Cursor header holds the cursor of the next page.
     """
     real_user_id = current_user.user_id 
 
-    api_db = await api_service.get_apikey(
+    api_db, next_cursor = await api_service.get_apikey(
         user_id=real_user_id,
+        limit=limit,
+        cursor=cursor,
+        is_active=is_active,
+        label_prefix=label_prefix,
         db=db, 
     )
-    
-    # Check if the list is empty
-    if not api_db:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No API keys found."
-        )
-    
+
+    headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else {}
+
+    if settings.FAST_JSON_RESPONSES:
+        return list_response(APIKEY_INFO_LIST, APIKeyInfo, api_db, headers=headers)
+
+    response.headers.update(headers)
     return api_db
 
-# 3. Delete API Key
+# 4. Delete API Key
 @router.delete("/delete", status_code=status.HTTP_200_OK)
 async def delete_apikey(
     label: str,
@@ -75,7 +106,39 @@ async def delete_apikey(
         db=db
     )
 
-# 4. Update API Key
+# 5. Delete API Keys in bulk
+@router.post("/bulk-delete", response_model=APIKeyBulkResult, status_code=status.HTTP_200_OK)
+async def delete_apikeys(
+    selector: APIKeyBulkSelector,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete API keys by key_ids, by labels, or all of them.
+    """
+    return await api_service.delete_apikeys(
+        user_id=current_user.user_id,
+        selector=selector.model_dump(exclude_unset=True),
+        db=db,
+    )
+
+# 6. Revoke API Keys in bulk
+@router.post("/bulk-revoke", response_model=APIKeyBulkResult, status_code=status.HTTP_200_OK)
+async def revoke_apikeys(
+    selector: APIKeyBulkSelector,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Deactivate API keys by key_ids, by labels, or all of them (revoke-all).
+    """
+    return await api_service.revoke_apikeys(
+        user_id=current_user.user_id,
+        selector=selector.model_dump(exclude_unset=True),
+        db=db,
+    )
+
+# 7. Update API Key
 @router.patch("/update/{key_id}", status_code=status.HTTP_200_OK)
 async def update_apikey(
     key_id: int,
@@ -98,7 +161,7 @@ async def update_apikey(
         db=db,
     )
 
-# 5. Roll API Key
+# 8. Roll API Key
 @router.post("/roll/{key_id}", response_model=APIKeyResponse, status_code=status.HTTP_200_OK)
 async def roll_apikey(
     key_id: int, 
@@ -115,8 +178,11 @@ async def roll_apikey(
 
     return rolled_key
 
-# 6. Validation API Key
-@router.get("/protected-api", status_code=status.HTTP_200_OK)
+# 9. Validation API Key
+@router.get("/protected-api", response_model=APIKeyInfo, status_code=status.HTTP_200_OK)
 async def get_data(apikey: APIKeyResponse = Depends(validate_apikey)):
+    """
+    Echo the validated key. Secret-derived columns (key_digest, lookup_id) are never serialized.
+    """
     return apikey
 
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,6 +13,9 @@ router = APIRouter()
 user_service = UserService()
 auth_service = AuthService()
 
+def client_address(request: Request) -> Optional[str]:
+    return request.client.host if request.client else None
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
@@ -22,16 +26,16 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login/form", response_model=Token, status_code=status.HTTP_200_OK)
-async def login_oauth2(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+async def login_oauth2(request: Request, background_tasks: BackgroundTasks, form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Swagger UI Login (Form Data).
     Required for the 'Authorize' button in API docs.
     """
-    return await auth_service.login_oauth2(db=db, form_data = form_data)
+    return await auth_service.login_oauth2(db=db, background_tasks=background_tasks, form_data = form_data, client=client_address(request))
 
 @router.post("/login", response_model=Token, status_code=status.HTTP_200_OK)
-async def login_js(login_data: UserLogin, db: AsyncSession = Depends(get_db)):
+async def login_js(request: Request, login_data: UserLogin, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
     """
     Frontend/API Login (JSON Body).
     """
-    return await auth_service.login(db=db, form_data=login_data)
\ No newline at end of file
+    return await auth_service.login(db=db, background_tasks=background_tasks, form_data=login_data, client=client_address(request))
\ No newline at end of file
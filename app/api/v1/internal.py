@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.cache import verified_key_cache, principal_cache, jwt_claims_cache
+from app.db.session import get_pool_stats
+from app.api.deps import require_admin
+
+# Worker telemetry is for operators only
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def read_cache_stats():
+    """
+    Hit/miss/eviction counters of the in-process caches of this worker.
+    """
+    return {
+        "verified_keys": verified_key_cache.stats(),
+        "principals": principal_cache.stats(),
+        "jwt_claims": jwt_claims_cache.stats(),
+    }
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def read_pool_stats():
+    """
+    Connection pool usage of this worker, including the checkout wait histogram.
+    """
+    return get_pool_stats()
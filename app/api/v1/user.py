@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, status
 
+from app.core.config import settings
+from app.core.responses import model_response
 from app.models.user import User
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, USER_RESPONSE
 from app.api.deps import get_current_user
 
 router = APIRouter()
@@ -21,6 +23,9 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     # We don't need to query the DB here.
     # The "get_current_user" dependency in has already validated the token,
     # fetched the user from the DB, and injected it into "current_user".
+    if settings.FAST_JSON_RESPONSES:
+        return model_response(USER_RESPONSE, UserResponse, current_user)
+
     return current_user
 
     
\ No newline at end of file
@@ -0,0 +1,60 @@
+import sys
+import json
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line. Dict messages are merged into the record as fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {"level": record.levelname, "logger": record.name}
+
+        if isinstance(record.msg, dict):
+            payload.update(record.msg)
+        else:
+            payload["message"] = record.getMessage()
+
+        return json.dumps(payload, default=str)
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Enqueue records untouched: formatting happens in the listener thread too.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+# Access records go through a queue so formatting and stdout writes happen in a
+# background thread instead of on the event loop.
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(JSONFormatter())
+
+_listener = QueueListener(_queue, _stream_handler, respect_handler_level=True)
+_listener_running = False
+
+access_logger = logging.getLogger("app.access")
+access_logger.addHandler(_DeferredQueueHandler(_queue))
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+
+def start_access_log() -> None:
+    global _listener_running
+
+    if not _listener_running:
+        _listener.start()
+        _listener_running = True
+
+def stop_access_log() -> None:
+    """
+    Stop the listener after writing every queued record.
+    """
+    global _listener_running
+
+    if _listener_running:
+        _listener.stop()
+        _listener_running = False
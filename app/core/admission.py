@@ -0,0 +1,119 @@
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import CallbackMetric, Histogram, HistogramCallback, registry
+
+class AdmissionGate:
+    """
+    Bounded concurrency for an expensive operation with a maximum queue wait.
+
+    At most max_concurrency callers hold a slot; the others wait up to
+    max_queue_wait seconds. Callers that would wait longer are shed with a 503
+    and Retry-After instead of piling up work the server cannot finish in time.
+    When the backlog alone is expected to exceed the budget, the request is
+    rejected right away without waiting at all.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue_wait: float, retry_after: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue_wait = max_queue_wait
+        self.retry_after = retry_after
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Moving average of how long a slot is held, to estimate queue wait
+        self._hold_seconds = 0.0
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_seconds = Histogram((0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        semaphore = self._get_semaphore()
+
+        # 1. Shed immediately when the backlog cannot clear within the budget
+        expected_wait = (self.waiting + 1) / self.max_concurrency * self._hold_seconds
+        if semaphore.locked() and expected_wait > self.max_queue_wait:
+            self._reject()
+
+        # 2. Wait for a slot, at most max_queue_wait seconds
+        self.waiting += 1
+        start = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            self._reject()
+        finally:
+            self.waiting -= 1
+            self.wait_seconds.observe(time.perf_counter() - start)
+
+        # 3. Run the operation
+        self.admitted += 1
+        self.in_flight += 1
+        acquired = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * (time.perf_counter() - acquired)
+            semaphore.release()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # A semaphore belongs to one event loop; recreate it for a new one
+        loop = asyncio.get_running_loop()
+
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self.waiting = 0
+            self.in_flight = 0
+
+        return self._semaphore
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry later.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+# Shared by every Argon2 hash and verification of this worker
+hash_gate = AdmissionGate(
+    max_concurrency=settings.HASH_MAX_CONCURRENCY,
+    max_queue_wait=settings.HASH_MAX_QUEUE_WAIT_SECONDS,
+    retry_after=settings.HASH_RETRY_AFTER_SECONDS,
+)
+
+registry.register(CallbackMetric(
+    "hash_admission_requests",
+    "Password hashing requests waiting for or holding a slot.",
+    lambda: {("waiting",): hash_gate.waiting, ("in_flight",): hash_gate.in_flight},
+    labelnames=("state",),
+))
+
+registry.register(CallbackMetric(
+    "hash_admission_total",
+    "Password hashing requests admitted or shed.",
+    lambda: {("admitted",): hash_gate.admitted, ("rejected",): hash_gate.rejected},
+    labelnames=("result",),
+    type_name="counter",
+))
+
+registry.register(HistogramCallback(
+    "hash_admission_wait_seconds",
+    "Time password hashing requests waited for a slot.",
+    hash_gate.wait_seconds,
+))
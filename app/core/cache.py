@@ -0,0 +1,309 @@
+import time
+from collections import OrderedDict
+from typing import Any, Collection, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import CallbackMetric, registry
+
+def snapshot_columns(instance: Any, exclude: Collection[str] = ()) -> Dict[str, Any]:
+    """
+    Copy the column values of an ORM instance so it can be cached outside its session.
+    """
+    return {
+        column.key: getattr(instance, column.key)
+        for column in instance.__table__.columns
+        if column.key not in exclude
+    }
+
+
+class LRUTTLCache:
+    """
+    Bounded in-process LRU cache whose entries also expire after a TTL.
+
+    All operations are synchronous (no awaits), so a single event loop can share
+    one instance between coroutines without locking.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (time.monotonic() + ttl, value)
+
+        # Evict least recently used entries beyond capacity
+        while len(self._data) > self.maxsize:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        if key in self._data:
+            self._remove(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        for key in list(self._data):
+            self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, value = self._data.pop(key)
+        self._on_remove(key, value)
+
+    def _on_remove(self, key: Hashable, value: Any) -> None:
+        """
+        Hook for subclasses keeping secondary indexes in sync.
+        """
+
+
+class VerifiedKeyCache(LRUTTLCache):
+    """
+    Cache of successfully verified API keys, keyed by the digest of the full
+    presented key. Values are column snapshots of the matching APIKey row so a hit
+    needs neither a database round trip nor an Argon2 verification.
+
+    The digest is all a lookup knows before its SELECT, so invalidations are
+    stamped with a cache-wide version: a lookup that read the version before an
+    invalidation of its key_id cannot repopulate the cache with the old row.
+    Only the newest maxsize stamps are kept; lookups older than a pruned stamp
+    simply skip caching.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._digest_by_key_id: Dict[int, str] = {}
+        self._version = 0
+        # key_id -> version of its last invalidation, the newest maxsize of them
+        self._invalidated_at: "OrderedDict[int, int]" = OrderedDict()
+        # Newest version whose stamp was pruned; older lookups are treated as stale
+        self._stamp_floor = 0
+
+    def version(self) -> int:
+        return self._version
+
+    def add(self, digest: str, snapshot: Dict[str, Any], version: int) -> None:
+        key_id = snapshot["key_id"]
+
+        # The key changed while this lookup was reading it (or it may have, and
+        # the stamp telling so was pruned)
+        if version < self._stamp_floor or self._invalidated_at.get(key_id, -1) > version:
+            return
+
+        # A key_id has exactly one valid secret at a time
+        previous = self._digest_by_key_id.get(key_id)
+        if previous is not None and previous != digest:
+            self.pop(previous)
+
+        self.set(digest, snapshot)
+
+        if digest in self._data:
+            self._digest_by_key_id[key_id] = digest
+
+    def invalidate(self, key_id: int) -> None:
+        self._version += 1
+        self._invalidated_at.pop(key_id, None)
+        self._invalidated_at[key_id] = self._version
+
+        # Keep the stamps bounded: only lookups older than the pruned ones need them
+        while len(self._invalidated_at) > max(self.maxsize, 1):
+            _, self._stamp_floor = self._invalidated_at.popitem(last=False)
+
+        digest = self._digest_by_key_id.get(key_id)
+        if digest is not None:
+            self.pop(digest)
+
+    def clear(self) -> None:
+        super().clear()
+        self._invalidated_at.clear()
+        self._stamp_floor = self._version
+
+    def _on_remove(self, key: Hashable, value: Any) -> None:
+        key_id = value["key_id"]
+        if self._digest_by_key_id.get(key_id) == key:
+            del self._digest_by_key_id[key_id]
+
+
+class PrincipalCache(LRUTTLCache):
+    """
+    Cache of authenticated users keyed by user_id.
+
+    Every change to a user row bumps that user's version. Entries are stored with
+    the version read before the DB lookup, so a lookup racing with an update can
+    never repopulate the cache with the old row.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[int, int] = {}
+
+    def version(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def get_principal(self, user_id: int) -> Optional[Dict[str, Any]]:
+        entry = self.get(user_id)
+
+        if entry is None:
+            return None
+
+        version, snapshot = entry
+
+        if version != self.version(user_id):
+            self.pop(user_id)
+            return None
+
+        return snapshot
+
+    def add(self, user_id: int, version: int, snapshot: Dict[str, Any]) -> None:
+        if version == self.version(user_id):
+            self.set(user_id, (version, snapshot))
+
+    def bump(self, user_id: int) -> None:
+        self._versions[user_id] = self.version(user_id) + 1
+        self.pop(user_id)
+
+    def clear(self) -> None:
+        super().clear()
+        self._versions.clear()
+
+
+class ClaimsCache(LRUTTLCache):
+    """
+    Cache of validated JWT claims keyed by the token string.
+
+    Each entry expires at the token's own exp (capped by the TTL). Entries are
+    only valid for the key fingerprint they were verified with; a lookup with a
+    different fingerprint drops the whole cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._fingerprint: Optional[str] = None
+
+    def get_claims(self, token: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        if fingerprint != self._fingerprint:
+            self.invalidations += len(self._data)
+            self.clear()
+            self._fingerprint = fingerprint
+
+        return self.get(token)
+
+    def add(self, token: str, claims: Dict[str, Any], fingerprint: str) -> None:
+        if fingerprint != self._fingerprint:
+            return
+
+        exp = claims.get("exp")
+        ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+
+        self.set(token, claims, ttl)
+
+    def clear(self) -> None:
+        super().clear()
+        self._fingerprint = None
+
+
+verified_key_cache = VerifiedKeyCache(
+    maxsize=settings.APIKEY_CACHE_MAXSIZE,
+    ttl=settings.APIKEY_CACHE_TTL_SECONDS,
+)
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+jwt_claims_cache = ClaimsCache(
+    maxsize=settings.JWT_CLAIMS_CACHE_MAXSIZE,
+    ttl=settings.JWT_CLAIMS_CACHE_TTL_SECONDS,
+)
+
+# Caches reported on /metrics, by name
+METERED_CACHES: Dict[str, LRUTTLCache] = {
+    "verified_keys": verified_key_cache,
+    "principals": principal_cache,
+    "jwt_claims": jwt_claims_cache,
+}
+
+registry.register(CallbackMetric(
+    "cache_lookups_total",
+    "Cache lookups by cache and result.",
+    lambda: {
+        (name, result): getattr(cache, result)
+        for name, cache in METERED_CACHES.items()
+        for result in ("hits", "misses")
+    },
+    labelnames=("cache", "result"),
+    type_name="counter",
+))
+
+registry.register(CallbackMetric(
+    "cache_removals_total",
+    "Cache entries removed by cache and reason.",
+    lambda: {
+        (name, reason): getattr(cache, reason)
+        for name, cache in METERED_CACHES.items()
+        for reason in ("evictions", "expirations", "invalidations")
+    },
+    labelnames=("cache", "reason"),
+    type_name="counter",
+))
+
+registry.register(CallbackMetric(
+    "cache_entries",
+    "Current number of entries by cache.",
+    lambda: {(name,): len(cache) for name, cache in METERED_CACHES.items()},
+    labelnames=("cache",),
+))
@@ -0,0 +1,140 @@
+"""
+Pick Argon2 parameters for this machine and write them to the settings file.
+
+Argon2id is tuned in the order recommended by RFC 9106: fix the parallelism,
+spend as much of the memory budget as allowed, then raise time_cost until a
+verification takes the target latency. The memory budget is shared by the
+HASH_EXECUTOR_WORKERS hashes that can run at once.
+
+Usage:
+    python -m app.core.calibrate --target-ms 250 --memory-budget-mib 512
+    python -m app.core.calibrate --dry-run
+"""
+import os
+import time
+import argparse
+import statistics
+from typing import Dict, NamedTuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# OWASP minimum for Argon2id: 19 MiB with time_cost=2
+MIN_MEMORY_COST = 19456
+MIN_TIME_COST = 2
+MAX_TIME_COST = 20
+
+class Argon2Parameters(NamedTuple):
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    verify_ms: float
+
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int = 5) -> float:
+    """
+    Median latency of one Argon2 verification with the given parameters.
+    """
+    context = CryptContext(
+        schemes=["argon2"],
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+    hashed = context.hash("calibration-password")
+
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, memory_budget_kib: int, concurrency: int, parallelism: int, samples: int = 5) -> Argon2Parameters:
+    """
+    Highest-cost parameters whose verify latency stays within target_ms.
+    """
+    # 1. Memory per hash, so `concurrency` hashes fit in the budget
+    memory_cost = max(MIN_MEMORY_COST, memory_budget_kib // concurrency)
+
+    # 2. Halve the memory while even the minimum time_cost is too slow
+    verify_ms = measure_verify_ms(MIN_TIME_COST, memory_cost, parallelism, samples)
+    while verify_ms > target_ms and memory_cost // 2 >= MIN_MEMORY_COST:
+        memory_cost //= 2
+        verify_ms = measure_verify_ms(MIN_TIME_COST, memory_cost, parallelism, samples)
+
+    best = Argon2Parameters(MIN_TIME_COST, memory_cost, parallelism, round(verify_ms, 1))
+
+    # 3. Raise time_cost while verification stays within the target
+    for time_cost in range(MIN_TIME_COST + 1, MAX_TIME_COST + 1):
+        verify_ms = measure_verify_ms(time_cost, memory_cost, parallelism, samples)
+        if verify_ms > target_ms:
+            break
+        best = Argon2Parameters(time_cost, memory_cost, parallelism, round(verify_ms, 1))
+
+    return best
+
+
+def update_env_file(path: str, values: Dict[str, object]) -> None:
+    """
+    Set KEY=value lines in a dotenv file, replacing existing keys and keeping everything else.
+    """
+    lines = []
+    if os.path.exists(path):
+        with open(path) as f:
+            lines = f.read().splitlines()
+
+    pending = dict(values)
+    for i, line in enumerate(lines):
+        name = line.split("=", 1)[0].strip()
+        if "=" in line and name in pending:
+            lines[i] = f"{name}={pending.pop(name)}"
+
+    if pending:
+        lines.append("")
+        lines.append("# --- ARGON2 (python -m app.core.calibrate) ---")
+        lines.extend(f"{name}={value}" for name, value in pending.items())
+
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="target verify latency (default 250)")
+    parser.add_argument("--memory-budget-mib", type=int, default=256, help="memory for all concurrent hashes (default 256)")
+    parser.add_argument("--concurrency", type=int, default=settings.HASH_EXECUTOR_WORKERS, help="hashes running at once (default HASH_EXECUTOR_WORKERS)")
+    parser.add_argument("--parallelism", type=int, default=min(4, os.cpu_count() or 1), help="Argon2 lanes per hash")
+    parser.add_argument("--samples", type=int, default=5, help="verifications timed per candidate")
+    parser.add_argument("--env-file", default=".env", help="settings file to update (default .env)")
+    parser.add_argument("--dry-run", action="store_true", help="print the parameters without writing them")
+    args = parser.parse_args()
+
+    result = calibrate(
+        target_ms=args.target_ms,
+        memory_budget_kib=args.memory_budget_mib * 1024,
+        concurrency=args.concurrency,
+        parallelism=args.parallelism,
+        samples=args.samples,
+    )
+
+    values = {
+        "ARGON2_TIME_COST": result.time_cost,
+        "ARGON2_MEMORY_COST": result.memory_cost,
+        "ARGON2_PARALLELISM": result.parallelism,
+    }
+
+    for name, value in values.items():
+        print(f"{name}={value}")
+    print(f"# verify latency {result.verify_ms} ms (target {args.target_ms} ms)")
+
+    if not args.dry_run:
+        update_env_file(args.env_file, values)
+        print(f"# written to {args.env_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,6 +8,10 @@ class Settings(BaseSettings):
     DEBUG: bool
     ENVIRONMENT: str
 
+    # ACCESS LOG
+    # Fraction of successful requests logged; errors are always logged.
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+
     # DATABASE
     DB_USER: str
     DB_PWD: str
@@ -13,10 +19,100 @@ class Settings(BaseSettings):
     DB_PORT: int = 5432
     DB_NAME: str
 
+    # DATABASE POOL
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    # asyncpg prepared statement cache per connection (set 0 behind pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
     # SECURITY
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: float
     SECRET_KEY: str
+    # Server secret for API key digests. Changing it invalidates every issued API
+    # key. Falls back to SECRET_KEY (with a warning at startup), which ties API
+    # keys to JWT secret rotation; set it separately.
+    APIKEY_HMAC_SECRET: Optional[str] = None
+    # ES256 access tokens: directory of <kid>.pem P-256 keys and the kid that
+    # signs (default: the last private key). Unset keeps HS256 with SECRET_KEY.
+    # Generate keys with `python -m app.core.jwt_keys --kid <kid>`.
+    JWT_KEYS_DIR: Optional[str] = None
+    JWT_ACTIVE_KID: Optional[str] = None
+    # How long verifiers may cache /.well-known/jwks.json
+    JWKS_MAX_AGE_SECONDS: int = 300
+    # Token for the admin endpoints (X-Admin-Token header); unset disables them
+    ADMIN_API_TOKEN: Optional[str] = None
+
+    # HASHING
+    # Argon2 runs off the event loop in a bounded pool of threads or processes.
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASH_EXECUTOR_WORKERS: int = 4
+    # Argon2 cost parameters; unset ones keep the passlib defaults. Pick them with
+    # `python -m app.core.calibrate`. Stored hashes made with other parameters are
+    # rehashed on the next successful login.
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None  # KiB
+    ARGON2_PARALLELISM: Optional[int] = None
+
+    # HASH ADMISSION
+    # Hashes allowed to run or queue in the executor at once; beyond that, requests
+    # wait up to HASH_MAX_QUEUE_WAIT_SECONDS and are then shed with a 503.
+    HASH_MAX_CONCURRENCY: int = 8
+    HASH_MAX_QUEUE_WAIT_SECONDS: float = 2.0
+    HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # RATE LIMITING
+    # Dotted path of the RateLimitStore class; the default keeps counters per worker.
+    RATE_LIMIT_STORE: str = "app.core.ratelimit.InMemoryRateLimitStore"
+    # Login attempts allowed per sliding window (0 disables the check)
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 10
+    LOGIN_RATE_LIMIT_PER_CLIENT: int = 100
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = 60
+    # Limits for API keys (0 = unlimited). Key owners can set lower per-key limits
+    # but never exceed these. Enforced per worker; daily usage is persisted
+    # through the usage buffer.
+    APIKEY_DEFAULT_RATE_LIMIT_PER_MINUTE: int = 0
+    APIKEY_DEFAULT_DAILY_QUOTA: int = 0
+    APIKEY_LIMITER_MAX_KEYS: int = 100000
+
+    # API KEY BULK OPERATIONS
+    APIKEY_BULK_MAX: int = 500
+
+    # API KEY LISTING
+    APIKEY_PAGE_SIZE: int = 100
+    APIKEY_PAGE_MAX: int = 1000
+
+    # RESPONSES
+    # Serve JSON with orjson (or pydantic-core when orjson is not installed) and
+    # build the hot responses straight from ORM attributes, skipping the
+    # response_model re-validation.
+    FAST_JSON_RESPONSES: bool = False
+
+    # EXPORT
+    # Rows fetched from the server-side cursor per NDJSON chunk
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # CACHE
+    # Verified API keys are cached per worker; revocations made on another
+    # worker take effect there after at most APIKEY_CACHE_TTL_SECONDS.
+    APIKEY_CACHE_MAXSIZE: int = 10000
+    APIKEY_CACHE_TTL_SECONDS: float = 60
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30
+    # Validated bearer token claims; entries also expire at the token's exp and
+    # are dropped when SECRET_KEY or ALGORITHM change.
+    JWT_CLAIMS_CACHE_MAXSIZE: int = 10000
+    JWT_CLAIMS_CACHE_TTL_SECONDS: float = 3600
+
+    # API KEY USAGE
+    # last_used_at is written behind: at most this many seconds stale.
+    APIKEY_USAGE_FLUSH_INTERVAL_SECONDS: float = 30
+    APIKEY_USAGE_MAX_PENDING: int = 10000
+    # Keys per UPDATE; ~10 bind parameters each, asyncpg allows 32767 per statement
+    APIKEY_USAGE_FLUSH_BATCH_SIZE: int = 1000
 
     @property
     def DATABASE_URL(self) -> str:
@@ -0,0 +1,150 @@
+"""
+ES256 signing keys for access tokens, with rotation and a public JWKS.
+
+Each <kid>.pem file in JWT_KEYS_DIR holds one P-256 key. Private keys can sign
+and verify; public-only files verify tokens of retired keys until they expire.
+JWT_ACTIVE_KID picks the signing key (default: the last private key by kid).
+
+Rotation:
+    1. Add the new private key; it is published in /.well-known/jwks.json.
+    2. After JWKS_MAX_AGE_SECONDS, make it JWT_ACTIVE_KID.
+    3. After ACCESS_TOKEN_EXPIRE_MINUTES, remove the old key.
+
+Usage:
+    python -m app.core.jwt_keys --keys-dir keys --kid 2026-10
+"""
+import os
+import json
+import hashlib
+import argparse
+from typing import Any, Dict, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+ALGORITHM = "ES256"
+
+class KeyRing:
+    """
+    The ES256 keys of this service, by kid. Empty when JWT_KEYS_DIR is unset,
+    in which case tokens stay HS256 with SECRET_KEY.
+    """
+
+    def __init__(self):
+        self.active_kid: Optional[str] = None
+        self._signing_keys: Dict[str, Key] = {}
+        self._verification_keys: Dict[str, Key] = {}
+        self.jwks: bytes = b'{"keys":[]}'
+        self.etag = ""
+        self.fingerprint = ""
+
+    def __len__(self) -> int:
+        return len(self._verification_keys)
+
+    def load(self, keys_dir: Optional[str], active_kid: Optional[str] = None) -> None:
+        """
+        Replace the keys with the PEM files of keys_dir (None empties the ring).
+        """
+        signing_keys: Dict[str, Key] = {}
+        verification_keys: Dict[str, Key] = {}
+        public_jwks = []
+
+        # 1. Read every <kid>.pem, in kid order
+        names = sorted(os.listdir(keys_dir)) if keys_dir else []
+        for name in names:
+            kid, ext = os.path.splitext(name)
+            if ext != ".pem":
+                continue
+
+            with open(os.path.join(keys_dir, name), "rb") as f:
+                private_key, public_key = _load_pem(f.read(), name)
+
+            public_pem = public_key.public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            verification_keys[kid] = jwk.construct(public_pem, ALGORITHM)
+            public_jwks.append({**verification_keys[kid].to_dict(), "kid": kid, "use": "sig"})
+
+            if private_key is not None:
+                private_pem = private_key.private_bytes(
+                    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+                )
+                signing_keys[kid] = jwk.construct(private_pem, ALGORITHM)
+
+        # 2. Pick the signing key
+        if active_kid is None and signing_keys:
+            active_kid = list(signing_keys)[-1]
+
+        if verification_keys and active_kid not in signing_keys:
+            raise ValueError(f"JWT_ACTIVE_KID {active_kid!r} has no private key in {keys_dir}")
+
+        # 3. Publish the public keys; the ETag changes with them
+        jwks = json.dumps({"keys": public_jwks}, separators=(",", ":"), sort_keys=True).encode()
+        digest = hashlib.sha256(jwks).hexdigest()
+
+        self.active_kid = active_kid if verification_keys else None
+        self._signing_keys = signing_keys
+        self._verification_keys = verification_keys
+        self.jwks = jwks
+        self.etag = f'"{digest[:32]}"' if verification_keys else ""
+        self.fingerprint = f"{self.active_kid}:{digest}" if verification_keys else ""
+
+    def signing_key(self) -> Optional[Key]:
+        if self.active_kid is None:
+            return None
+        return self._signing_keys[self.active_kid]
+
+    def verification_key(self, kid: Any) -> Optional[Key]:
+        return self._verification_keys.get(kid) if isinstance(kid, str) else None
+
+
+def _load_pem(data: bytes, name: str):
+    if b"PRIVATE KEY" in data:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+    else:
+        private_key = None
+        public_key = serialization.load_pem_public_key(data)
+
+    if not isinstance(public_key, ec.EllipticCurvePublicKey) or public_key.curve.name != "secp256r1":
+        raise ValueError(f"{name}: only P-256 EC keys (ES256) are supported")
+
+    return private_key, public_key
+
+
+def generate_key(keys_dir: str, kid: str) -> str:
+    """
+    Write a new P-256 private key to keys_dir/<kid>.pem, readable by the owner only.
+    """
+    path = os.path.join(keys_dir, f"{kid}.pem")
+    pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    )
+
+    os.makedirs(keys_dir, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+
+    return path
+
+
+jwt_keyring = KeyRing()
+jwt_keyring.load(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys-dir", default=settings.JWT_KEYS_DIR or "keys", help="directory of the PEM files (default JWT_KEYS_DIR)")
+    parser.add_argument("--kid", required=True, help="key id, also the file name")
+    args = parser.parse_args()
+
+    print(generate_key(args.keys_dir, args.kid))
+
+
+if __name__ == "__main__":
+    main()
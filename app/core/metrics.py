@@ -0,0 +1,217 @@
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Metrics live in the worker process and are only updated from its event loop
+# thread, so plain ints/floats are enough: no locks, no shared memory. With several
+# workers, each one exposes its own counters.
+
+class Histogram:
+    """
+    Fixed-bucket histogram. Observations only touch plain ints and floats, so it is
+    cheap enough for hot paths and needs no lock within one event loop.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket plus the +Inf overflow slot
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Cumulative bucket counts, as in the Prometheus exposition format.
+        """
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            cumulative.append({"le": "+Inf" if bound == float("inf") else bound, "count": running})
+
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *labelvalues: str):
+        child = self._children.get(labelvalues)
+
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[labelvalues] = self._new_child()
+
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for labelvalues, child in self._children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(child.value)}"
+
+
+class HistogramVec(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> Histogram:
+        return Histogram(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for labelvalues, child in self._children.items():
+            yield from _histogram_samples(self.name, self.labelnames, labelvalues, child)
+
+
+class CallbackMetric(_Metric):
+    """
+    Metric whose samples are read at scrape time from a callback returning
+    {labelvalues: value}, for state that already lives elsewhere (pool, caches).
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Dict[Tuple[str, ...], float]], labelnames: Sequence[str] = (), type_name: str = "gauge"):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type_name = type_name
+
+    def _samples(self) -> Iterable[str]:
+        for labelvalues, value in self.callback().items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class HistogramCallback(_Metric):
+    """
+    Exposes an existing Histogram instance under a metric name.
+    """
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, histogram: Histogram):
+        super().__init__(name, documentation)
+        self.histogram = histogram
+
+    def _samples(self) -> Iterable[str]:
+        return _histogram_samples(self.name, (), (), self.histogram)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Text exposition format (version 0.0.4).
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[Any]) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, labelvalues))
+    return "{" + pairs + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+def _histogram_samples(name: str, labelnames: Sequence[str], labelvalues: Sequence[str], histogram: Histogram) -> Iterable[str]:
+    running = 0
+    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+        running += count
+        le = "+Inf" if bound == float("inf") else repr(float(bound))
+        yield f"{name}_bucket{_format_labels(tuple(labelnames) + ('le',), tuple(labelvalues) + (le,))} {running}"
+    yield f"{name}_sum{_format_labels(labelnames, labelvalues)} {_format_value(histogram.sum)}"
+    yield f"{name}_count{_format_labels(labelnames, labelvalues)} {histogram.count}"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+))
+
+HTTP_REQUEST_DURATION = registry.register(HistogramVec(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ("method", "route"),
+))
+
+ARGON2_DURATION = registry.register(HistogramVec(
+    "argon2_duration_seconds",
+    "Time spent in Argon2 hashing, excluding executor queueing.",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+))
+
+JWT_DECODE_DURATION = registry.register(HistogramVec(
+    "jwt_decode_duration_seconds",
+    "Time spent decoding and verifying access tokens.",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+))
+
+DB_QUERY_DURATION = registry.register(HistogramVec(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements.",
+))
@@ -0,0 +1,98 @@
+import time
+import random
+from datetime import datetime, timezone
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.access_log import access_logger
+from app.core.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION
+
+# Methods labelled as themselves; clients can send any verb, the rest are "OTHER"
+METRIC_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency and status counters.
+
+    Routes are labelled with their path template ("/update/{key_id}"), never the
+    raw URL, and unknown methods as "OTHER", so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "<unmatched>"
+            method = scope["method"] if scope["method"] in METRIC_METHODS else "OTHER"
+
+            HTTP_REQUEST_DURATION.labels(method, route_path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
+
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI middleware emitting one structured access record per request and
+    the X-Process-Time response header.
+
+    Successful requests are sampled with ACCESS_LOG_SAMPLE_RATE; errors (status
+    >= 400 or unhandled exceptions) are always logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start:.4f}s")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 400 or random.random() < settings.ACCESS_LOG_SAMPLE_RATE:
+                self._log(scope, status_code, time.perf_counter() - start)
+
+    @staticmethod
+    def _log(scope: Scope, status_code: int, duration: float) -> None:
+        route = scope.get("route")
+        client = scope.get("client")
+
+        access_logger.info({
+            "time": datetime.now(timezone.utc).isoformat(),
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "client": client[0] if client else None,
+        })
@@ -0,0 +1,394 @@
+import math
+import time
+import importlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import CallbackMetric, registry
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    # Seconds until the next attempt would be allowed (0 when allowed)
+    retry_after: float
+
+
+class RateLimitStore(ABC):
+    """
+    Storage backend of the sliding-window limiter.
+
+    Methods are async so a store shared between workers (e.g. Redis) can be
+    dropped in through the RATE_LIMIT_STORE setting.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        """
+        Count one attempt for key unless it exceeds limit per window seconds.
+        """
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """
+        Forget the attempts recorded for key.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        Forget every key.
+        """
+
+
+class _Window:
+    __slots__ = ("start", "previous", "current")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.previous = 0
+        self.current = 0
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Per-worker sliding-window counters.
+
+    Each key keeps the counts of the current and previous fixed windows; the
+    previous count is weighted by how much of it still overlaps the sliding
+    window. Keys are spread over shards so each hit sweeps only one shard for
+    expired windows, and every shard is capped at max_keys_per_shard entries
+    (least recently used first), which bounds memory under key floods.
+
+    Not thread-safe: all access happens on the worker's event loop.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10000):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards: List["OrderedDict[str, Tuple[float, _Window]]"] = [OrderedDict() for _ in range(shards)]
+        self._sweep_index = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.monotonic()
+        shard = self._shards[hash(key) % len(self._shards)]
+
+        # 1. Load the window, rolling it forward if time has passed
+        entry = shard.get(key)
+        counts = entry[1] if entry is not None else _Window(now)
+        elapsed = now - counts.start
+
+        if elapsed >= window:
+            periods = int(elapsed // window)
+            counts.previous = counts.current if periods == 1 else 0
+            counts.current = 0
+            counts.start += periods * window
+            elapsed = now - counts.start
+
+        # 2. Estimate the attempts within the sliding window
+        weight = 1 - elapsed / window
+        estimate = counts.previous * weight + counts.current
+
+        if estimate + 1 > limit:
+            result = RateLimitResult(False, 0, self._retry_after(counts, limit, window, elapsed))
+        else:
+            counts.current += 1
+            result = RateLimitResult(True, int(limit - estimate - 1), 0.0)
+
+        # 3. Store with its expiry: the counts matter for two windows at most
+        shard[key] = (counts.start + 2 * window, counts)
+        shard.move_to_end(key)
+
+        while len(shard) > self.max_keys_per_shard:
+            shard.popitem(last=False)
+            self.evictions += 1
+
+        self._sweep(now)
+
+        return result
+
+    async def reset(self, key: str) -> None:
+        self._shards[hash(key) % len(self._shards)].pop(key, None)
+
+    async def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    @staticmethod
+    def _retry_after(counts: _Window, limit: int, window: float, elapsed: float) -> float:
+        # The previous window's weight decays enough before the current one ends
+        if counts.previous and counts.current + 1 <= limit:
+            return max(0.0, window * (1 - (limit - 1 - counts.current) / counts.previous) - elapsed)
+
+        # Otherwise the current window must roll over and decay in turn
+        return window - elapsed + window * max(0.0, 1 - (limit - 1) / counts.current)
+
+    def _sweep(self, now: float) -> None:
+        """
+        Drop expired keys from the least recently used end of the next shard.
+        """
+        shard = self._shards[self._sweep_index]
+        self._sweep_index = (self._sweep_index + 1) % len(self._shards)
+
+        while shard:
+            key, (expires_at, _) = next(iter(shard.items()))
+            if expires_at > now:
+                break
+            del shard[key]
+
+
+def load_store(path: str) -> RateLimitStore:
+    """
+    Instantiate the RateLimitStore class named by a dotted path.
+    """
+    module_name, _, class_name = path.rpartition(".")
+    store_class = getattr(importlib.import_module(module_name), class_name)
+
+    if not issubclass(store_class, RateLimitStore):
+        raise TypeError(f"{path} is not a RateLimitStore")
+
+    return store_class()
+
+
+class LoginRateLimiter:
+    """
+    Throttles login attempts per username and per client address, before any
+    database lookup or password hashing. A limit of 0 disables that check.
+    """
+
+    def __init__(self, store: RateLimitStore, per_username: int, per_client: int, window: float):
+        self.store = store
+        self.per_username = per_username
+        self.per_client = per_client
+        self.window = window
+
+        self.rejected: Dict[str, int] = {"username": 0, "client": 0}
+
+    async def check(self, username: str, client: Optional[str]) -> None:
+        checks = (
+            ("client", client, self.per_client),
+            ("username", username.lower(), self.per_username),
+        )
+
+        for scope, value, limit in checks:
+            if not value or limit <= 0:
+                continue
+
+            result = await self.store.hit(f"login:{scope}:{value}", limit, self.window)
+
+            if not result.allowed:
+                self.rejected[scope] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many login attempts, please retry later.",
+                    headers={"Retry-After": str(max(1, round(result.retry_after)))},
+                )
+
+
+class GCRALimiter:
+    """
+    Generic cell rate algorithm: one theoretical arrival time (TAT) per key.
+
+    A key may send `limit` requests per `period` seconds, with bursts of up to
+    `limit` requests. Keys whose TAT is in the past are equivalent to unknown
+    keys, so the least recently used entries can be dropped beyond max_keys.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tat: "OrderedDict[Any, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+    def hit(self, key: Any, limit: int, period: float) -> Tuple[RateLimitResult, float]:
+        """
+        Returns the result and the seconds until the key's full burst is available again.
+        """
+        now = time.monotonic()
+        interval = period / limit
+        tat = max(self._tat.get(key, now), now)
+
+        # Earliest time this request may arrive without exceeding the burst
+        allow_at = tat + interval - period
+
+        if now < allow_at:
+            return RateLimitResult(False, 0, allow_at - now), tat - now
+
+        tat += interval
+        self._tat[key] = tat
+        self._tat.move_to_end(key)
+
+        while len(self._tat) > self.max_keys:
+            self._tat.popitem(last=False)
+
+        remaining = int((now - (tat - period)) // interval)
+        return RateLimitResult(True, remaining, 0.0), tat - now
+
+    def forget(self, key: Any) -> None:
+        self._tat.pop(key, None)
+
+    def clear(self) -> None:
+        self._tat.clear()
+
+
+class APIKeyLimiter:
+    """
+    Per-key request rate (GCRA, per minute) and daily quota, enforced in memory.
+
+    Daily usage starts from the persisted quota_used/quota_day columns the first
+    time a worker sees a key; afterwards the worker counts locally and the usage
+    buffer writes the increments back. Limits of None fall back to the settings
+    defaults, and 0 means unlimited.
+    """
+
+    def __init__(self, max_keys: int):
+        self.rate = GCRALimiter(max_keys=max_keys)
+        self.max_keys = max_keys
+        # key_id -> [day, requests counted that day]
+        self._usage: "OrderedDict[int, List[Any]]" = OrderedDict()
+
+        self.rejected: Dict[str, int] = {"rate": 0, "quota": 0}
+
+    def check(self, api_key, now: Optional[datetime] = None) -> Dict[str, str]:
+        """
+        Count one request for api_key. Returns the RateLimit-* headers, or raises
+        429 with them when the key is over its rate limit or daily quota.
+        """
+        now = now or datetime.now(timezone.utc)
+        rate_limit = _limit_or_default(api_key.rate_limit_per_minute, settings.APIKEY_DEFAULT_RATE_LIMIT_PER_MINUTE)
+        daily_quota = _limit_or_default(api_key.daily_quota, settings.APIKEY_DEFAULT_DAILY_QUOTA)
+
+        # (limit, remaining, seconds until reset, retry after when exhausted)
+        windows = []
+
+        # 1. Daily quota, checked first so throttled requests are not counted
+        usage = None
+        if daily_quota:
+            usage = self._usage_today(api_key, now.date())
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+            until_midnight = (midnight - now).total_seconds()
+
+            if usage[1] >= daily_quota:
+                self.rejected["quota"] += 1
+                self._reject([(daily_quota, 0, until_midnight)], until_midnight, "Daily quota exceeded for this API key.")
+
+            windows.append((daily_quota, daily_quota - usage[1] - 1, until_midnight))
+
+        # 2. Request rate
+        if rate_limit:
+            result, reset_after = self.rate.hit(api_key.key_id, rate_limit, 60.0)
+
+            if not result.allowed:
+                self.rejected["rate"] += 1
+                self._reject([(rate_limit, 0, reset_after)], result.retry_after, "Rate limit exceeded for this API key.")
+
+            windows.append((rate_limit, result.remaining, reset_after))
+
+        # 3. Count against the quota only once admitted
+        if usage is not None:
+            usage[1] += 1
+
+        return _ratelimit_headers(windows)
+
+    def quota_day(self, key_id: int) -> Optional[date]:
+        """
+        Day of the local usage count of a key, if it has a quota being tracked.
+        """
+        usage = self._usage.get(key_id)
+        return usage[0] if usage is not None else None
+
+    def forget(self, key_id: int) -> None:
+        self.rate.forget(key_id)
+        self._usage.pop(key_id, None)
+
+    def clear(self) -> None:
+        self.rate.clear()
+        self._usage.clear()
+
+    def _usage_today(self, api_key, today: date) -> List[Any]:
+        usage = self._usage.get(api_key.key_id)
+
+        if usage is None:
+            # First sight on this worker: start from the persisted counter
+            used = (api_key.quota_used or 0) if api_key.quota_day == today else 0
+            usage = self._usage[api_key.key_id] = [today, used]
+        elif usage[0] != today:
+            usage[0], usage[1] = today, 0
+
+        self._usage.move_to_end(api_key.key_id)
+
+        while len(self._usage) > self.max_keys:
+            self._usage.popitem(last=False)
+
+        return usage
+
+    @staticmethod
+    def _reject(windows, retry_after: float, detail: str) -> None:
+        headers = _ratelimit_headers(windows)
+        headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers=headers,
+        )
+
+
+def _limit_or_default(value: Optional[int], default: int) -> int:
+    """
+    The limit enforced for a key. Owners set their own limits, so a per-key
+    value can only tighten the server default (0 = unlimited), never raise or
+    remove it.
+    """
+    if not value:
+        return default
+    return min(value, default) if default else value
+
+def _ratelimit_headers(windows: List[Tuple[int, int, float]]) -> Dict[str, str]:
+    """
+    RateLimit-* headers (IETF httpapi draft) for the window closest to exhaustion.
+    """
+    if not windows:
+        return {}
+
+    limit, remaining, reset = min(windows, key=lambda window: window[1])
+
+    return {
+        "RateLimit-Limit": str(limit),
+        "RateLimit-Remaining": str(max(0, remaining)),
+        "RateLimit-Reset": str(max(0, math.ceil(reset))),
+    }
+
+
+login_limiter = LoginRateLimiter(
+    store=load_store(settings.RATE_LIMIT_STORE),
+    per_username=settings.LOGIN_RATE_LIMIT_PER_USERNAME,
+    per_client=settings.LOGIN_RATE_LIMIT_PER_CLIENT,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
+
+apikey_limiter = APIKeyLimiter(max_keys=settings.APIKEY_LIMITER_MAX_KEYS)
+
+registry.register(CallbackMetric(
+    "apikey_throttled_total",
+    "API key requests rejected by reason (rate limit or daily quota).",
+    lambda: {(reason,): count for reason, count in apikey_limiter.rejected.items()},
+    labelnames=("reason",),
+    type_name="counter",
+))
+
+registry.register(CallbackMetric(
+    "login_throttled_total",
+    "Login attempts rejected by the rate limiter, by limit.",
+    lambda: {(scope,): count for scope, count in login_limiter.rejected.items()},
+    labelnames=("limit",),
+    type_name="counter",
+))
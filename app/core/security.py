@@ -1,13 +1,79 @@
+import hmac
+import time
+import zlib
+import asyncio
+import hashlib
 import secrets
-from jose import jwt
+from typing import Dict, NamedTuple, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 from datetime import datetime, timezone, timedelta
 
 from app.core.config import settings
+from app.core.metrics import ARGON2_DURATION
+from app.core.jwt_keys import ALGORITHM as JWT_KEYRING_ALGORITHM, jwt_keyring
+
+_hash_executor: Optional[Executor] = None
+
+def get_hash_executor() -> Executor:
+    """
+    Return the shared pool used for CPU-bound hashing, creating it on first use.
+    """
+    global _hash_executor
+
+    if _hash_executor is None:
+        if settings.HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.HASH_EXECUTOR_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.HASH_EXECUTOR_WORKERS,
+                thread_name_prefix="hash-worker",
+            )
+
+    return _hash_executor
+
+def _timed(fn, *args):
+    """
+    Run fn in the executor and report how long it took, so the event loop thread
+    records the duration without counting time spent queued.
+    """
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True, cancel_futures=True)
+        _hash_executor = None
+
+def argon2_options() -> Dict[str, int]:
+    """
+    CryptContext keyword arguments for the configured Argon2 parameters.
+    """
+    options = {
+        "time_cost": settings.ARGON2_TIME_COST,
+        "memory_cost": settings.ARGON2_MEMORY_COST,
+        "parallelism": settings.ARGON2_PARALLELISM,
+    }
+    return {f"argon2__{name}": value for name, value in options.items() if value is not None}
+
+# API key layout: sk_<env>_v2_<lookup id><secret><crc32>
+APIKEY_VERSION = "v2"
+APIKEY_LOOKUP_ID_LENGTH = 16
+APIKEY_SECRET_LENGTH = 43
+APIKEY_CHECKSUM_LENGTH = 8
+APIKEY_ENVIRONMENTS = ("live", "test")
+
+class ParsedAPIKey(NamedTuple):
+    version: int
+    lookup_id: Optional[str] = None
 
 class SecurityUtils:
     
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **argon2_options())
 
     @staticmethod
     def get_hashed_token(plain_password: str) -> str:
@@ -17,6 +83,35 @@ class SecurityUtils:
     def verify_token(plain_password: str, hashed_password :str) -> bool:
         return SecurityUtils.pwd_context.verify(plain_password, hashed_password)
 
+    @staticmethod
+    def token_needs_update(hashed_password: str) -> bool:
+        """
+        True when the hash was made with other Argon2 parameters than configured.
+        """
+        return SecurityUtils.pwd_context.needs_update(hashed_password)
+
+    @staticmethod
+    async def get_hashed_token_async(plain_password: str) -> str:
+        """
+        Hash in the hash executor so the event loop keeps serving other requests.
+        """
+        loop = asyncio.get_running_loop()
+        hashed, elapsed = await loop.run_in_executor(get_hash_executor(), _timed, SecurityUtils.get_hashed_token, plain_password)
+        ARGON2_DURATION.labels("hash").observe(elapsed)
+
+        return hashed
+
+    @staticmethod
+    async def verify_token_async(plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify in the hash executor so the event loop keeps serving other requests.
+        """
+        loop = asyncio.get_running_loop()
+        valid, elapsed = await loop.run_in_executor(get_hash_executor(), _timed, SecurityUtils.verify_token, plain_password, hashed_password)
+        ARGON2_DURATION.labels("verify").observe(elapsed)
+
+        return valid
+
     @staticmethod
     def create_access_token(data: dict) -> str:
         """
@@ -29,7 +124,17 @@ class SecurityUtils:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode.update({"exp": expire})
 
-        # 3. Sign and Encode
+        # 3. Sign and Encode, with the active ES256 key when a keyring is configured
+        signing_key = jwt_keyring.signing_key()
+
+        if signing_key is not None:
+            return jwt.encode(
+                claims=to_encode,
+                key=signing_key,
+                algorithm=JWT_KEYRING_ALGORITHM,
+                headers={"kid": jwt_keyring.active_kid},
+            )
+
         encoded_jwt = jwt.encode(
             claims=to_encode, 
             key=settings.SECRET_KEY, 
@@ -37,8 +142,86 @@ class SecurityUtils:
         )
         
         return encoded_jwt
+
+    @staticmethod
+    def decode_access_token(token: str) -> dict:
+        """
+        Verify a JWT and return its claims; raises JWTError when it is invalid.
+        With a keyring, the key is picked by the token's kid header.
+        """
+        if not len(jwt_keyring):
+            return jwt.decode(token=token, key=settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+        key = jwt_keyring.verification_key(jwt.get_unverified_header(token).get("kid"))
+        if key is None:
+            raise JWTError("Unknown signing key")
+
+        return jwt.decode(token=token, key=key, algorithms=[JWT_KEYRING_ALGORITHM])
+
+    @staticmethod
+    def jwt_key_fingerprint() -> str:
+        """
+        Digest of the JWT verification keys and algorithm. Claims validated under
+        one fingerprint must not be trusted once it changes.
+        """
+        material = jwt_keyring.fingerprint or f"{settings.ALGORITHM}:{settings.SECRET_KEY}"
+        return hashlib.sha256(material.encode()).hexdigest()
     
     @staticmethod
     def create_api_token(length: int = 32) -> str:
         token = secrets.token_urlsafe(length)
         return token
+
+    @staticmethod
+    def get_apikey_digest(key: str) -> str:
+        """
+        Keyed HMAC-SHA256 digest of a full API key.
+
+        API keys carry 256 bits of entropy, so a fast keyed digest is as safe as Argon2
+        for them and can be looked up with a single indexed equality query.
+        """
+        secret = settings.APIKEY_HMAC_SECRET or settings.SECRET_KEY
+        return hmac.new(secret.encode(), key.encode(), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def create_api_key(environment: str) -> Tuple[str, str]:
+        """
+        Generate a versioned API key. Returns the key and its lookup id.
+        """
+        lookup_id = secrets.token_hex(APIKEY_LOOKUP_ID_LENGTH // 2)
+        body = f"sk_{environment}_{APIKEY_VERSION}_{lookup_id}{SecurityUtils.create_api_token()}"
+
+        return body + SecurityUtils._api_key_checksum(body), lookup_id
+
+    @staticmethod
+    def parse_api_key(key: str) -> Optional[ParsedAPIKey]:
+        """
+        Check the format of an API key without touching the database.
+        Returns None for malformed keys so they can be rejected right away.
+        """
+        # 1. Legacy keys: sk_<env>_<secret>
+        if len(key) == 8 + APIKEY_SECRET_LENGTH:
+            if key[:8] in {f"sk_{env}_" for env in APIKEY_ENVIRONMENTS}:
+                return ParsedAPIKey(version=1)
+            return None
+
+        # 2. Versioned keys: fixed layout protected by a checksum
+        header_length = len(f"sk_live_{APIKEY_VERSION}_")
+        expected_length = header_length + APIKEY_LOOKUP_ID_LENGTH + APIKEY_SECRET_LENGTH + APIKEY_CHECKSUM_LENGTH
+
+        if len(key) != expected_length:
+            return None
+
+        if key[:header_length] not in {f"sk_{env}_{APIKEY_VERSION}_" for env in APIKEY_ENVIRONMENTS}:
+            return None
+
+        body, checksum = key[:-APIKEY_CHECKSUM_LENGTH], key[-APIKEY_CHECKSUM_LENGTH:]
+
+        if not hmac.compare_digest(checksum, SecurityUtils._api_key_checksum(body)):
+            return None
+
+        return ParsedAPIKey(version=2, lookup_id=key[header_length:header_length + APIKEY_LOOKUP_ID_LENGTH])
+
+    @staticmethod
+    def _api_key_checksum(body: str) -> str:
+        return f"{zlib.crc32(body.encode()):08x}"
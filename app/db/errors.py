@@ -0,0 +1,50 @@
+import re
+from typing import Optional
+
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+
+from app.db.base import Base
+
+# SQLite names either the index or the table.columns of a failed UNIQUE check
+_SQLITE_INDEX = re.compile(r"UNIQUE constraint failed: index '([^']+)'")
+_SQLITE_COLUMNS = re.compile(r"UNIQUE constraint failed: ([\w.]+(?:, [\w.]+)*)")
+
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    """
+    Name of the constraint or unique index an IntegrityError violated, or None
+    when the driver does not tell (e.g. NOT NULL or foreign key failures on SQLite).
+    """
+    # 1. PostgreSQL: asyncpg (chained under the DBAPI adapter) and psycopg
+    for candidate in (error.orig, getattr(error.orig, "__cause__", None)):
+        name = getattr(candidate, "constraint_name", None)
+        name = name or getattr(getattr(candidate, "diag", None), "constraint_name", None)
+        if name:
+            return name
+
+    # 2. SQLite: match the reported columns against the unique indexes of the table
+    message = str(error.orig)
+
+    match = _SQLITE_INDEX.search(message)
+    if match:
+        return match.group(1)
+
+    match = _SQLITE_COLUMNS.search(message)
+    if not match:
+        return None
+
+    qualified = match.group(1).split(", ")
+    table = Base.metadata.tables.get(qualified[0].split(".")[0])
+    columns = [name.split(".")[-1] for name in qualified]
+
+    if table is None:
+        return None
+
+    unique = [index for index in table.indexes if index.unique]
+    unique += [c for c in table.constraints if isinstance(c, (UniqueConstraint, PrimaryKeyConstraint))]
+
+    for constraint in unique:
+        if [column.name for column in constraint.columns] == columns:
+            return constraint.name
+
+    return None
@@ -1,9 +1,62 @@
+import time
+from typing import Any, Dict
+
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy import DateTime, func
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.engine import Engine
+from sqlalchemy import DateTime, func, exc, event
 
 from app.core.config import settings
+from app.core.metrics import (
+    Histogram, HistogramCallback, CallbackMetric, registry, DB_QUERY_DURATION,
+)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that records how long callers wait to get a connection.
+    """
+
+    wait_seconds = Histogram()
+    checkouts = 0
+    timeouts = 0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            InstrumentedQueuePool.timeouts += 1
+            raise
+        finally:
+            InstrumentedQueuePool.wait_seconds.observe(time.perf_counter() - start)
+
+        InstrumentedQueuePool.checkouts += 1
+        return connection
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _observe_query_time(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start", None)
+    if start is not None:
+        DB_QUERY_DURATION.observe(time.perf_counter() - start)
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
 
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -11,4 +64,47 @@ AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
-    
\ No newline at end of file
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Live statistics of the application's connection pool.
+    """
+    pool = engine.sync_engine.pool
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT,
+        "checkouts_total": InstrumentedQueuePool.checkouts,
+        "timeouts_total": InstrumentedQueuePool.timeouts,
+        "wait_seconds": InstrumentedQueuePool.wait_seconds.snapshot(),
+    }
+
+
+registry.register(HistogramCallback(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    InstrumentedQueuePool.wait_seconds,
+))
+
+registry.register(CallbackMetric(
+    "db_pool_connections",
+    "Connections of the application pool by state.",
+    lambda: {
+        ("checked_out",): engine.sync_engine.pool.checkedout(),
+        ("checked_in",): engine.sync_engine.pool.checkedin(),
+        ("overflow",): engine.sync_engine.pool.overflow(),
+    },
+    labelnames=("state",),
+))
+
+registry.register(CallbackMetric(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT.",
+    lambda: {(): InstrumentedQueuePool.timeouts},
+    type_name="counter",
+))
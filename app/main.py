@@ -1,12 +1,20 @@
-import time
 import logging
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from contextlib import asynccontextmanager
 from starlette.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.api.v1 import user, auth, apikey
+from app.core.security import shutdown_hash_executor
+from app.core.metrics import registry
+from app.core.jwt_keys import jwt_keyring
+from app.core.responses import FastJSONResponse
+from app.core.middleware import MetricsMiddleware, AccessLogMiddleware
+from app.core.access_log import start_access_log, stop_access_log
+from app.services.usage_buffer import key_usage_buffer
+from app.api.v1 import user, auth, apikey, internal, admin
+from app.api.deps import require_admin
 from app.db.session import engine
 from app.db.base import Base
 from app.models.user import User
@@ -14,22 +22,34 @@ from app.models.apikey import APIKey
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+start_access_log()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("LIFESPAN STARTUP: Application starting up.")
+    if not settings.APIKEY_HMAC_SECRET:
+        logger.warning("APIKEY_HMAC_SECRET is not set: API key digests use SECRET_KEY, so rotating it invalidates every API key.")
+    start_access_log()
     try:
         # async with engine.begin() as conn:
         #     await conn.run_sync(Base.metadata.create_all) 
         logger.info("DATABASE: Connection established.")
     except Exception as e:
         logger.error(f"DATABASE ERROR: Failed to establish connection to the database. Error: {e}")
+    key_usage_buffer.start()
     yield
     logger.info("LIFESPAN SHUTDOWN: Application is shutting down.")
+    try:
+        await key_usage_buffer.stop()
+    except Exception as e:
+        logger.error(f"KEY USAGE FLUSH ERROR: Failed to write pending usage on shutdown. Error: {e}")
+    shutdown_hash_executor()
+    stop_access_log()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse,
 )
 
 app.add_middleware(
@@ -40,30 +60,43 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type", "X-API-Key"],
 )
 
-@app.middleware("http")
-async def log_requests_and_time(request: Request, call_next):
-    
-    start_time = time.time()
-    logger.info(f"REQUEST START | Method: {request.method} | Path: {request.url.path}")
-
-    response = await call_next(request)
-
-    process_time = time.time() - start_time
-    
-    response.headers["X-Process-Time"] = f"{process_time:.4f}s"
-    
-    logger.info(
-        f"REQUEST END | Status: {response.status_code} | "
-        f"Time: {process_time:.4f}s | Path: {request.url.path}"
-    )
-
-    return response
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(AccessLogMiddleware)
 
 app.include_router(user.router, prefix="/api/v1/users", tags=["User"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(apikey.router, prefix="/api/v1/keys", tags=["APIKey"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
+app.include_router(internal.router, prefix="/api/v1/internal", tags=["Internal"], include_in_schema=False)
 
 
 @app.get("/")
 async def root():
-    return {"message": "Server started successfully"}
\ No newline at end of file
+    return {"message": "Server started successfully"}
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def metrics():
+    """
+    Prometheus text exposition of this worker's metrics. Pool and cache figures
+    are internal, so scrapers send the X-Admin-Token header.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks(request: Request):
+    """
+    Public keys that verify our access tokens, for services checking them locally.
+    """
+    headers = {"Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"}
+
+    if jwt_keyring.etag:
+        headers["ETag"] = jwt_keyring.etag
+
+        if_none_match = request.headers.get("if-none-match", "")
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if jwt_keyring.etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=jwt_keyring.jwks, media_type="application/jwk-set+json", headers=headers)
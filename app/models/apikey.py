@@ -1,21 +1,38 @@
 from typing import List
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Boolean, text, ForeignKey, DateTime
+from sqlalchemy import Integer, String, Boolean, text, ForeignKey, DateTime, Date, Index, UniqueConstraint
 
 from app.db.base import Base
 
 class APIKey(Base):
     __tablename__ = "apikeys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "label", name="uq_apikeys_user_id_label"),
+        # Keyset pagination of a user's keys, optionally by status
+        Index("ix_apikeys_user_id_key_id", "user_id", "key_id"),
+        Index("ix_apikeys_user_id_is_active_key_id", "user_id", "is_active", "key_id"),
+        # Label prefix search (LIKE 'prefix%') regardless of the database collation
+        Index("ix_apikeys_user_id_label_pattern", "user_id", "label", postgresql_ops={"label": "varchar_pattern_ops"}),
+    )
+
     key_id : Mapped[int]  = mapped_column(Integer, primary_key=True)
     prefix: Mapped[str] = mapped_column(String(10), index=True)
-    key : Mapped[str] = mapped_column(String(100))
+    key : Mapped[str] = mapped_column(String(100), nullable=True)
+    lookup_id: Mapped[str] = mapped_column(String(16), unique=True, index=True, nullable=True)
+    key_digest: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=True)
     label: Mapped[str] = mapped_column(String(50))
     description : Mapped[str] = mapped_column(String(150), nullable=True)
-    user_id : Mapped[int] = mapped_column(Integer, ForeignKey("users.user_id"))
+    user_id : Mapped[int] = mapped_column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"))
     is_active: Mapped[bool] = mapped_column(Boolean, server_default=text("true"))
     last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Per-key limits; None uses the settings defaults
+    rate_limit_per_minute: Mapped[int] = mapped_column(Integer, nullable=True)
+    daily_quota: Mapped[int] = mapped_column(Integer, nullable=True)
+    # Requests counted against daily_quota on quota_day (written behind)
+    quota_used: Mapped[int] = mapped_column(Integer, server_default=text("0"))
+    quota_day: Mapped[date] = mapped_column(Date, nullable=True)
 
     user: Mapped["User"] = relationship(back_populates="keys")
 
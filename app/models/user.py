@@ -1,21 +1,28 @@
 from typing import List
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Boolean, text, ForeignKey
+from sqlalchemy import Integer, String, Boolean, text, ForeignKey, Index
 
 from app.db.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Emails are unique regardless of case
+        Index("uq_users_email_lower", text("lower(email)"), unique=True),
+    )
+
     user_id: Mapped[int]  = mapped_column(Integer, primary_key=True, index=True)
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
-    email: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    email: Mapped[str] = mapped_column(String(50), nullable=False)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     points: Mapped[int] = mapped_column(Integer, server_default=text("0"))
     rank: Mapped[str] = mapped_column(String(20), server_default="Bronze")
     is_active: Mapped[bool] = mapped_column(Boolean, server_default=text("true"))
 
-    keys : Mapped[List["APIKey"]] = relationship(back_populates="user", lazy="selectin", cascade="all, delete-orphan")
+    # Never loaded implicitly: use selectinload(User.keys) where keys are needed.
+    # Deleting a user leaves its keys to the ON DELETE CASCADE of the database.
+    keys : Mapped[List["APIKey"]] = relationship(back_populates="user", lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self) -> str:
         return f"<User(user_id={self.user_id}, username='{self.username}', rank='{self.rank}'), is_active:{self.is_active}>"
\ No newline at end of file
@@ -1,10 +1,15 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.core.responses import response_adapter
 
 class APIKeyCreate(BaseModel): 
     label: str
     description: Optional[str] = None
+    # Can only lower the server defaults; omit to use them
+    rate_limit_per_minute: Optional[int] = Field(None, ge=1)
+    daily_quota: Optional[int] = Field(None, ge=1)
 
 class APIKeyResponse(BaseModel):
     key_id: int
@@ -20,10 +25,38 @@ class APIKeyInfo(BaseModel):
     is_active: bool
     created_at: Optional[datetime] = None
     last_used_at: Optional[datetime] = None
+    rate_limit_per_minute: Optional[int] = None
+    daily_quota: Optional[int] = None
     
     model_config = ConfigDict(from_attributes=True)
 
+# Compiled once at import for the fast listing response
+APIKEY_INFO_LIST = response_adapter(APIKeyInfo, many=True)
+
 class APIKeyUpdate(BaseModel):
     label: Optional[str] = None 
     description: Optional[str] = None
-    is_active: Optional[bool] = None
\ No newline at end of file
+    is_active: Optional[bool] = None
+    # Can only lower the server defaults; omit to use them
+    rate_limit_per_minute: Optional[int] = Field(None, ge=1)
+    daily_quota: Optional[int] = Field(None, ge=1)
+
+    @field_validator("label", "is_active")
+    @classmethod
+    def reject_null(cls, value):
+        # Optional only so the field can be omitted; the columns are NOT NULL
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+class APIKeyBulkSelector(BaseModel):
+    """
+    Keys targeted by a bulk operation: exactly one of key_ids, labels or all.
+    """
+    key_ids: Optional[List[int]] = None
+    labels: Optional[List[str]] = None
+    all: bool = False
+
+class APIKeyBulkResult(BaseModel):
+    message: str
+    key_ids: List[int]
@@ -1,6 +1,8 @@
 from datetime import datetime
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 
+from app.core.responses import response_adapter
+
 class UserCreate(BaseModel):
     email: EmailStr = Field(...)
     username: str = Field(..., min_length=6, max_length=20)
@@ -18,4 +20,7 @@ class UserResponse(BaseModel):
     rank: str
     created_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Compiled once at import for the fast /users/me response
+USER_RESPONSE = response_adapter(UserResponse)
@@ -1,12 +1,26 @@
-from typing import Dict, Any
+import hmac
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
 
+from app.db.errors import violated_constraint
 from app.models.apikey import APIKey
-from app.core.security import SecurityUtils
+from app.schemas.apikey import APIKeyInfo
+from app.core.security import SecurityUtils, get_hash_executor
 from app.core.config import settings
+from app.core.cache import verified_key_cache, snapshot_columns
+from app.core.ratelimit import apikey_limiter
+from app.core.admission import hash_gate
+
+# Unique (user_id, label) constraint of apikeys
+LABEL_CONSTRAINT = "uq_apikeys_user_id_label"
+
+# Columns served by the listing endpoint
+APIKEY_INFO_COLUMNS = [getattr(APIKey, field) for field in APIKeyInfo.model_fields]
 
 class APIService:
     """
@@ -32,44 +46,145 @@ class APIService:
                 detail=f"API key label '{key_label}' already exists."
             )
         
-        # 2. Generate secure token
-        generated_token = SecurityUtils.create_api_token()
-
-        # 3. Add prefix based on environment
-        if settings.ENVIRONMENT == "prod":
-            key = f"sk_live_{generated_token}"
-        else:
-            key = f"sk_test_{generated_token}"
+        # 2. Generate secure key
+        key, key_fields = self._generate_key()
         
-        prefix = key[:10]
-
-        hashed_key = SecurityUtils.get_hashed_token(key[10:])
-        
-        # 4. Save to database
+        # 3. Save to database
         key_db = APIKey(
             user_id=user_id,
-            prefix=prefix,
-            key=hashed_key,
             is_active=True,
+            **key_fields,
             **key_data
         )
 
         db.add(key_db)
-        await db.commit()
+
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            # A concurrent request took the label after the check above
+            await db.rollback()
+            if violated_constraint(e) != LABEL_CONSTRAINT:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"API key label '{key_label}' already exists."
+            )
+
         await db.refresh(key_db)
 
         key_db.key = key
 
         return key_db
     
-    async def get_apikey(self, db: AsyncSession, user_id: int):
+    async def create_apikeys(self, db: AsyncSession, user_id: int, keys_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Retrieve all API keys for the specified user.
+        Create a batch of API keys in one transaction. Plaintext keys are only returned here.
         """
-        stmt = (select(APIKey).where(APIKey.user_id==user_id))
-        result = await db.execute(stmt)
+        # 1. Validate the batch itself
+        if not 0 < len(keys_data) <= settings.APIKEY_BULK_MAX:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Provide between 1 and {settings.APIKEY_BULK_MAX} API keys."
+            )
+
+        labels = [key_data["label"] for key_data in keys_data]
+        repeated = sorted({label for label in labels if labels.count(label) > 1})
+
+        if repeated:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Duplicate API key labels in request: {', '.join(repeated)}."
+            )
+
+        # 2. Check every label with one query
+        stmt = (
+            select(APIKey.label).
+            where(APIKey.user_id==user_id, APIKey.label.in_(labels))
+        )
+
+        existing = (await db.execute(stmt)).scalars().all()
+
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"API key labels already exist: {', '.join(sorted(existing))}."
+            )
+
+        # 3. Generate keys and digests across the hash executor workers
+        generated = await self._generate_key_batch(len(keys_data))
+
+        # 4. Insert every row with one multi-row INSERT ... RETURNING
+        rows = [
+            {"user_id": user_id, "is_active": True, **key_fields, **key_data}
+            for (_, key_fields), key_data in zip(generated, keys_data)
+        ]
 
-        return result.scalars().all()
+        # RETURNING order is not guaranteed: match rows back through lookup_id
+        stmt = (
+            insert(APIKey).
+            returning(APIKey.key_id, APIKey.label, APIKey.lookup_id)
+        )
+
+        try:
+            result = await db.execute(stmt, rows)
+            created = result.all()
+            await db.commit()
+        except IntegrityError as e:
+            # A concurrent request took one of the labels
+            await db.rollback()
+            if violated_constraint(e) != LABEL_CONSTRAINT:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="API key labels already exist."
+            )
+
+        rows_by_lookup_id = {row.lookup_id: row for row in created}
+        response = []
+
+        for key, key_fields in generated:
+            row = rows_by_lookup_id[key_fields["lookup_id"]]
+            response.append({"key_id": row.key_id, "key": key, "label": row.label})
+
+        return response
+
+    async def get_apikey(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        label_prefix: Optional[str] = None,
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        Retrieve one page of the user's API keys (keyset on key_id) and the next cursor.
+        Only the APIKeyInfo columns are selected.
+        """
+        stmt = (
+            select(*APIKEY_INFO_COLUMNS).
+            where(APIKey.user_id==user_id).
+            order_by(APIKey.key_id).
+            limit(limit + 1)
+        )
+
+        if cursor is not None:
+            stmt = stmt.where(APIKey.key_id > cursor)
+
+        if is_active is not None:
+            stmt = stmt.where(APIKey.is_active==is_active)
+
+        if label_prefix:
+            stmt = stmt.where(APIKey.label.startswith(label_prefix, autoescape=True))
+
+        rows = (await db.execute(stmt)).all()
+
+        # One extra row tells whether another page follows
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1].key_id
+
+        return rows, None
     
     async def delete_apikey(self, db: AsyncSession, label: str, user_id: int) -> Dict:
         """
@@ -95,102 +210,212 @@ class APIService:
         await db.delete(apikey_db)
         await db.commit()
 
+        verified_key_cache.invalidate(apikey_db.key_id)
+        apikey_limiter.forget(apikey_db.key_id)
+
         return {"message": "APIkey deleted successfully."}
     
-    async def update_apikey(self, db: AsyncSession, user_id:int, key_id: int, update_data: Dict[str, Any]):
+    async def revoke_apikeys(self, db: AsyncSession, user_id: int, selector: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Update API key details (label, description, is_active) dynamically.
+        Deactivate the selected keys of the user with one UPDATE.
         """
-        # 1. Check if key exists and belongs to user
-        stmt_key_check = (
-            select(APIKey).
-            where(APIKey.user_id==user_id, APIKey.key_id==key_id)
-            
+        stmt = (
+            update(APIKey).
+            where(*self._selector_conditions(user_id, selector), APIKey.is_active.is_(True)).
+            values(is_active=False).
+            returning(APIKey.key_id).
+            execution_options(synchronize_session=False)
         )
 
-        key_exist = await db.execute(stmt_key_check)
+        key_ids = (await db.execute(stmt)).scalars().all()
+        await db.commit()
+
+        for key_id in key_ids:
+            verified_key_cache.invalidate(key_id)
+
+        return {"message": f"{len(key_ids)} API key(s) revoked.", "key_ids": key_ids}
 
-        if not key_exist.scalar_one_or_none():
+    async def delete_apikeys(self, db: AsyncSession, user_id: int, selector: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Permanently delete the selected keys of the user with one DELETE.
+        """
+        stmt = (
+            delete(APIKey).
+            where(*self._selector_conditions(user_id, selector)).
+            returning(APIKey.key_id).
+            execution_options(synchronize_session=False)
+        )
+
+        key_ids = (await db.execute(stmt)).scalars().all()
+        await db.commit()
+
+        for key_id in key_ids:
+            verified_key_cache.invalidate(key_id)
+            apikey_limiter.forget(key_id)
+
+        return {"message": f"{len(key_ids)} API key(s) deleted.", "key_ids": key_ids}
+
+    @staticmethod
+    def _selector_conditions(user_id: int, selector: Dict[str, Any]) -> list:
+        """
+        WHERE clauses for a bulk selector; exactly one of key_ids, labels or all.
+        """
+        key_ids = selector.get("key_ids")
+        labels = selector.get("labels")
+        select_all = selector.get("all", False)
+
+        if sum((key_ids is not None, labels is not None, bool(select_all))) != 1:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail= f"API key with ID {key_id} not found."
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide exactly one of key_ids, labels or all."
             )
-        
-        # 2. Ensure data is provided
-        if len(update_data)==0:
+
+        values = key_ids if key_ids is not None else labels
+
+        if values is not None and not 0 < len(values) <= settings.APIKEY_BULK_MAX:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No fields provided for update."
+                detail=f"Provide between 1 and {settings.APIKEY_BULK_MAX} API keys."
             )
-        
-        # 3. Check for label duplication (excluding current key)
-        if "label" in update_data:
-            new_label = update_data["label"]
 
-            stmt_label_check = (
-                select(APIKey).
-                where(APIKey.user_id==user_id, APIKey.key_id!=key_id, APIKey.label==new_label)
-            )
+        conditions = [APIKey.user_id==user_id]
 
-            label_duplicate = await db.execute(stmt_label_check)
+        if key_ids is not None:
+            conditions.append(APIKey.key_id.in_(key_ids))
+        elif labels is not None:
+            conditions.append(APIKey.label.in_(labels))
 
-            if label_duplicate.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"APIKey with label '{new_label}' is already existed."
-                )
-        
-        # 4. Check status redundancy
-        if "is_active" in update_data:
-            new_status = update_data["is_active"]
+        return conditions
 
-            stmt_status_check = (
-                select(APIKey).
-                where(APIKey.user_id==user_id, APIKey.key_id==key_id, APIKey.is_active==new_status)
+    async def update_apikey(self, db: AsyncSession, user_id:int, key_id: int, update_data: Dict[str, Any]):
+        """
+        Update API key details (label, description, is_active) dynamically.
+        """
+        # 1. Ensure data is provided
+        if len(update_data)==0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No fields provided for update."
             )
 
-            status_check = await db.execute(stmt_status_check)
+        # 2. Update in one statement: the key must belong to the user and a status
+        #    change must actually change it; the (user_id, label) constraint
+        #    rejects duplicate labels
+        conditions = [APIKey.user_id==user_id, APIKey.key_id==key_id]
 
-            if status_check.scalar_one_or_none():
-                status_str = "active" if new_status else "inactive"
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"API key is already {status_str}."
-                )            
+        if "is_active" in update_data:
+            conditions.append(APIKey.is_active!=update_data["is_active"])
 
-        # 5. Update key
         stmt_update = (
             update(APIKey).
-            where(APIKey.user_id==user_id, APIKey.key_id==key_id).
-            values(**update_data)
+            where(*conditions).
+            values(**update_data).
+            returning(APIKey.key_id)
         )
 
-        await db.execute(stmt_update)
+        try:
+            result = await db.execute(stmt_update)
+            updated_key_id = result.scalar_one_or_none()
+        except IntegrityError as e:
+            await db.rollback()
+            if violated_constraint(e) != LABEL_CONSTRAINT:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"APIKey with label '{update_data.get('label')}' is already existed."
+            )
+
+        # 3. Nothing updated: tell a missing key from a redundant status change
+        if updated_key_id is None:
+            await db.rollback()
+            await self._raise_update_failure(db, user_id=user_id, key_id=key_id, update_data=update_data)
+
         await db.commit()
 
+        verified_key_cache.invalidate(key_id)
+
         return {"message": f"API Key {key_id} updated successfully."}
+
+    async def _raise_update_failure(self, db: AsyncSession, user_id: int, key_id: int, update_data: Dict[str, Any]) -> None:
+        """
+        Raise the error explaining why an update matched no row. Only runs on failure.
+        """
+        stmt_key_check = (
+            select(APIKey.is_active).
+            where(APIKey.user_id==user_id, APIKey.key_id==key_id)
+        )
+
+        is_active = (await db.execute(stmt_key_check)).scalar_one_or_none()
+
+        if is_active is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail= f"API key with ID {key_id} not found."
+            )
+
+        status_str = "active" if is_active else "inactive"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"API key is already {status_str}."
+        )
     
     async def verify_key_and_get_key(self, key: str, db: AsyncSession) -> APIKey:
         """
         Verify API key.
         """
-        prefix = key[:10]
-        raw_key = key[10:]
-
-        # 1. Check if prefix exists and verify key by raw_key
-        stmt = (
-            select(APIKey).
-            where(APIKey.prefix == prefix)
+        invalid_key_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or unauthorized access.",
         )
 
-        res = await db.execute(stmt)
-        api_key_db = res.scalar_one_or_none()
+        # 1. Reject malformed keys (wrong layout or checksum) without a DB hit
+        parsed_key = SecurityUtils.parse_api_key(key)
 
-        if not api_key_db or not SecurityUtils.verify_token(raw_key,api_key_db.key):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or unauthorized access.",
-            )       
+        if parsed_key is None:
+            raise invalid_key_exception
+
+        digest = SecurityUtils.get_apikey_digest(key)
+
+        # 2. Serve previously verified keys from the in-process cache
+        snapshot = verified_key_cache.get(digest)
+
+        if snapshot is not None:
+            return APIKey(**snapshot)
+
+        # Read before the SELECT, so a concurrent invalidation is not undone below
+        cache_version = verified_key_cache.version()
+
+        # 3. Resolve versioned keys through their unique lookup id
+        if parsed_key.lookup_id is not None:
+            stmt = (
+                select(APIKey).
+                where(APIKey.lookup_id == parsed_key.lookup_id)
+            )
+
+            res = await db.execute(stmt)
+            api_key_db = res.scalar_one_or_none()
+
+            if not api_key_db or not hmac.compare_digest(api_key_db.key_digest or "", digest):
+                raise invalid_key_exception
+
+        # 4. Legacy keys: look up by digest, then fall back to Argon2 hashes
+        else:
+            stmt = (
+                select(APIKey).
+                where(APIKey.key_digest == digest)
+            )
+
+            res = await db.execute(stmt)
+            api_key_db = res.scalar_one_or_none()
+
+            if not api_key_db:
+                api_key_db = await self._verify_legacy_key(key=key, digest=digest, db=db)
+
+            if not api_key_db:
+                raise invalid_key_exception
+
+        # 5. Remember the verified key until it expires or is invalidated
+        verified_key_cache.add(digest, snapshot_columns(api_key_db), cache_version)
 
         return api_key_db
     
@@ -210,19 +435,80 @@ class APIService:
                 detail=f"APIKey {key_id} not found."
             )
         
-        generated_token = SecurityUtils.create_api_token()
+        key, key_fields = self._generate_key()
 
-        if settings.ENVIRONMENT == "prod":
-            key = f"sk_live_{generated_token}"
-        else:
-            key = f"sk_test_{generated_token}"
-        
+        for field, value in key_fields.items():
+            setattr(apikey_db, field, value)
+
+        await db.commit()
+
+        verified_key_cache.invalidate(apikey_db.key_id)
+
+        return {"key_id": apikey_db.key_id, "key": key, "label": apikey_db.label}
+
+    @staticmethod
+    def _generate_key() -> Tuple[str, Dict[str, Any]]:
+        """
+        Generate a new key for the current environment and the columns identifying it.
+        """
+        environment = "live" if settings.ENVIRONMENT == "prod" else "test"
+        key, lookup_id = SecurityUtils.create_api_key(environment)
+
+        return key, {
+            "prefix": key[:10],
+            "lookup_id": lookup_id,
+            "key_digest": SecurityUtils.get_apikey_digest(key),
+            "key": None,
+        }
+
+    @staticmethod
+    def _generate_keys(count: int) -> List[Tuple[str, Dict[str, Any]]]:
+        return [APIService._generate_key() for _ in range(count)]
+
+    async def _generate_key_batch(self, count: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate count keys in chunks spread over the hash executor, off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        workers = settings.HASH_EXECUTOR_WORKERS
+        sizes = [count // workers + (1 if i < count % workers else 0) for i in range(workers)]
+
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(get_hash_executor(), APIService._generate_keys, size)
+            for size in sizes if size
+        ))
+
+        return [generated for chunk in chunks for generated in chunk]
+
+    async def _verify_legacy_key(self, key: str, digest: str, db: AsyncSession) -> Optional[APIKey]:
+        """
+        Verify a key issued before digests were introduced and migrate it on success.
+        """
         prefix = key[:10]
-        hashed_key = SecurityUtils.get_hashed_token(key[10:])
+        raw_key = key[10:]
+
+        # 1. Find unmigrated keys sharing the prefix (the legacy prefix is not unique)
+        stmt = (
+            select(APIKey).
+            where(APIKey.prefix == prefix, APIKey.key_digest.is_(None))
+        )
 
-        apikey_db.prefix = prefix
-        apikey_db.key = hashed_key
+        res = await db.execute(stmt)
+
+        # 2. Verify key by raw_key against each candidate; every Argon2 verify
+        #    holds a hash_gate slot, so a flood of guesses is shed with 503
+        for api_key_db in res.scalars().all():
+            async with hash_gate.slot():
+                valid = await SecurityUtils.verify_token_async(raw_key, api_key_db.key)
+            if valid:
+                break
+        else:
+            return None
 
+        # 3. Replace the Argon2 hash with the digest
+        api_key_db.key_digest = digest
+        api_key_db.key = None
         await db.commit()
+        await db.refresh(api_key_db)
 
-        return {"key_id": apikey_db.key_id, "key": key, "label": apikey_db.label}
+        return api_key_db
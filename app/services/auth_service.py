@@ -1,31 +1,41 @@
-from fastapi import HTTPException, status, Depends
+from typing import Optional
+
+from fastapi import BackgroundTasks, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.user import UserLogin
 from app.core.security import SecurityUtils
+from app.core.admission import hash_gate
+from app.core.ratelimit import login_limiter
 from app.services.user_service import UserService
 
 class AuthService:
     def __init__(self):
         self.user_service = UserService()
 
-    async def login_oauth2(self, db: AsyncSession, form_data: OAuth2PasswordRequestForm = Depends()):
+    async def login_oauth2(self, db: AsyncSession, background_tasks: BackgroundTasks, form_data: OAuth2PasswordRequestForm = Depends(), client: Optional[str] = None):
         """
         Handles login request using Form Data (Standard for Swagger UI).
         """
+        # 0. Throttle repeated attempts before touching the DB or Argon2
+        await login_limiter.check(username=form_data.username, client=client)
+
         # 1. Retrive user by username
-        user = await self.user_service.get_by_username(username = form_data.username, db=db)
+        user = await self.user_service.get_login_credentials(username=form_data.username, db=db)
 
         # 2. Verify user existence and password hash
-        if not user or not SecurityUtils.verify_token(form_data.password, user.password):
+        if not user or not await self._verify_password(form_data.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # 3. Generate JWT Access Token
+        # 3. Upgrade outdated hashes once the response is sent
+        self._schedule_rehash(db, background_tasks, user, form_data.password)
+
+        # 4. Generate JWT Access Token
         access_token = SecurityUtils.create_access_token(data={"sub": str(user.user_id)})
         
         return {
@@ -33,25 +43,51 @@ class AuthService:
             "token_type": "bearer"
         }
 
-    async def login(self, db: AsyncSession, form_data: UserLogin):
+    async def login(self, db: AsyncSession, background_tasks: BackgroundTasks, form_data: UserLogin, client: Optional[str] = None):
         """
         Handles login request using JSON Body (Standard for Frontend/Mobile).
         """
+        # 0. Throttle repeated attempts before touching the DB or Argon2
+        await login_limiter.check(username=form_data.username, client=client)
+
         # 1. Retrive user by username
-        user = await self.user_service.get_by_username(username=form_data.username, db=db)
+        user = await self.user_service.get_login_credentials(username=form_data.username, db=db)
 
         # 2. Verify user existence and password hash
-        if not user or not SecurityUtils.verify_token(form_data.password, user.password):
+        if not user or not await self._verify_password(form_data.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # 3. Generate JWT Access Token
+        # 3. Upgrade outdated hashes once the response is sent
+        self._schedule_rehash(db, background_tasks, user, form_data.password)
+
+        # 4. Generate JWT Access Token
         access_token = SecurityUtils.create_access_token(data={"sub": str(user.user_id)})
 
         return {
             "access_token": access_token, 
             "token_type": "bearer"
-        }
\ No newline at end of file
+        }
+
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify through the hash admission gate (503 when the hashing backlog is full).
+        """
+        async with hash_gate.slot():
+            return await SecurityUtils.verify_token_async(plain_password, hashed_password)
+
+    def _schedule_rehash(self, db: AsyncSession, background_tasks: BackgroundTasks, user, plain_password: str) -> None:
+        """
+        Rehash the password in the background if its Argon2 parameters are outdated.
+        """
+        if SecurityUtils.token_needs_update(user.password):
+            background_tasks.add_task(
+                self.user_service.rehash_password,
+                db=db,
+                user_id=user.user_id,
+                old_hash=user.password,
+                plain_password=plain_password,
+            )
@@ -0,0 +1,66 @@
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.apikey import APIKey
+
+# Exported columns; secrets (password, key hash, digest, lookup id) are never selected
+USER_EXPORT_COLUMNS = (
+    User.user_id, User.username, User.email, User.points, User.rank, User.is_active,
+    User.created_at, User.updated_at,
+)
+
+APIKEY_EXPORT_COLUMNS = (
+    APIKey.key_id, APIKey.user_id, APIKey.prefix, APIKey.label, APIKey.description,
+    APIKey.is_active, APIKey.last_used_at, APIKey.rate_limit_per_minute, APIKey.daily_quota,
+    APIKey.quota_used, APIKey.quota_day, APIKey.created_at, APIKey.updated_at,
+)
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+class ExportService:
+    """
+    Streams whole tables as NDJSON with constant memory.
+
+    Rows are read through a server-side cursor (AsyncSession.stream with
+    yield_per), one partition at a time, and each partition becomes one chunk
+    of the response. The next partition is only fetched once the previous
+    chunk has been handed to the server, so a slow client slows the cursor
+    down instead of filling worker memory.
+    """
+
+    async def stream_users(self, db: AsyncSession, since: Optional[datetime], batch_size: int) -> AsyncIterator[bytes]:
+        async for chunk in self._stream(db, User, USER_EXPORT_COLUMNS, User.user_id, since, batch_size):
+            yield chunk
+
+    async def stream_apikeys(self, db: AsyncSession, since: Optional[datetime], batch_size: int) -> AsyncIterator[bytes]:
+        async for chunk in self._stream(db, APIKey, APIKEY_EXPORT_COLUMNS, APIKey.key_id, since, batch_size):
+            yield chunk
+
+    async def _stream(self, db: AsyncSession, model, columns: Sequence, order_by, since: Optional[datetime], batch_size: int) -> AsyncIterator[bytes]:
+        # 1. Select the exported columns in primary key order
+        stmt = (
+            select(*columns).
+            order_by(order_by).
+            execution_options(yield_per=batch_size)
+        )
+
+        # 2. Incremental export: rows created or updated since the last run
+        if since is not None:
+            stmt = stmt.where(func.coalesce(model.updated_at, model.created_at) >= since)
+
+        # 3. Fetch and encode one partition at a time
+        result = await db.stream(stmt)
+
+        async for partition in result.partitions():
+            yield "".join(
+                json.dumps(row._asdict(), default=_json_default, separators=(",", ":")) + "\n"
+                for row in partition
+            ).encode()
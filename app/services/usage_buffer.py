@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, literal, update
+
+from app.models.apikey import APIKey
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+class KeyUsageBuffer:
+    """
+    Write-behind buffer for APIKey.last_used_at.
+
+    Authenticated requests only record the latest usage time per key in memory;
+    a background task writes everything pending every flush_interval seconds,
+    which is also the staleness bound of the column. Each multi-row UPDATE covers
+    at most batch_size keys, keeping its bind parameters (up to ~10 per key) well
+    below the 32767 asyncpg accepts.
+
+    Requests counted against a daily quota are written the same way, as
+    increments of quota_used, so counts from several workers add up.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int, batch_size: int = 1000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        # Keys whose unwritten usage was discarded after failed flushes
+        self.dropped = 0
+
+        self._pending: Dict[int, datetime] = {}
+        # key_id -> (quota day, requests not yet written for that day)
+        self._quota_pending: Dict[int, Tuple[date, int]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, key_id: int, used_at: datetime, quota_day: Optional[date] = None) -> None:
+        self._pending[key_id] = used_at
+
+        if quota_day is not None:
+            day, count = self._quota_pending.get(key_id, (quota_day, 0))
+            # Unwritten counts of a previous day no longer matter
+            self._quota_pending[key_id] = (quota_day, count + 1 if day == quota_day else 1)
+
+        # Flush early rather than let the buffer grow without bound
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._quota_pending.clear()
+
+    async def flush(self, session_factory=AsyncSessionLocal) -> int:
+        """
+        Write all pending timestamps, batch_size keys per UPDATE and transaction.
+        Returns the number of keys updated.
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        quota_pending, self._quota_pending = self._quota_pending, {}
+
+        key_ids = list(pending)
+        written = 0
+
+        try:
+            async with session_factory() as session:
+                for start in range(0, len(key_ids), self.batch_size):
+                    batch = key_ids[start:start + self.batch_size]
+                    stmt = self._update_statement(
+                        {key_id: pending[key_id] for key_id in batch},
+                        {key_id: quota_pending[key_id] for key_id in batch if key_id in quota_pending},
+                    )
+
+                    await session.execute(stmt)
+                    await session.commit()
+                    written += len(batch)
+        except Exception:
+            # Keep the unwritten batches for the next flush
+            dropped_before = self.dropped
+            self._restore(key_ids[written:], pending, quota_pending)
+
+            if self.dropped > dropped_before:
+                logger.warning("Key usage buffer full: discarded the usage of %s keys", self.dropped - dropped_before)
+            raise
+
+        return written
+
+    @staticmethod
+    def _update_statement(pending: Dict[int, datetime], quota_pending: Dict[int, Tuple[date, int]]):
+        values = {
+            "last_used_at": case(
+                {key_id: literal(used_at, APIKey.last_used_at.type) for key_id, used_at in pending.items()},
+                value=APIKey.key_id,
+            ),
+        }
+
+        if quota_pending:
+            # Add to the stored count of the same day, restart it on a new day
+            values["quota_used"] = case(
+                *[
+                    (and_(APIKey.key_id == key_id, APIKey.quota_day == literal(day, APIKey.quota_day.type)), APIKey.quota_used + count)
+                    for key_id, (day, count) in quota_pending.items()
+                ],
+                *[(APIKey.key_id == key_id, count) for key_id, (day, count) in quota_pending.items()],
+                else_=APIKey.quota_used,
+            )
+            values["quota_day"] = case(
+                {key_id: literal(day, APIKey.quota_day.type) for key_id, (day, _) in quota_pending.items()},
+                value=APIKey.key_id,
+                else_=APIKey.quota_day,
+            )
+
+        return (
+            update(APIKey).
+            where(APIKey.key_id.in_(pending)).
+            values(**values).
+            execution_options(synchronize_session=False)
+        )
+
+    def _restore(self, key_ids, pending: Dict[int, datetime], quota_pending: Dict[int, Tuple[date, int]]) -> None:
+        """
+        Put unwritten keys back, never growing the buffer past max_pending so a
+        failing database cannot make every later flush bigger.
+        """
+        for key_id in key_ids:
+            if key_id not in self._pending and len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                continue
+
+            # Newer records win
+            self._pending.setdefault(key_id, pending[key_id])
+
+            # Counts of the same day add up with those recorded meanwhile
+            if key_id in quota_pending:
+                day, count = quota_pending[key_id]
+                current_day, current = self._quota_pending.get(key_id, (day, 0))
+                if current_day == day:
+                    self._quota_pending[key_id] = (day, current + count)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background task and write whatever is still pending.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"KEY USAGE FLUSH ERROR: {e}")
+
+
+key_usage_buffer = KeyUsageBuffer(
+    flush_interval=settings.APIKEY_USAGE_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.APIKEY_USAGE_MAX_PENDING,
+    batch_size=settings.APIKEY_USAGE_FLUSH_BATCH_SIZE,
+)
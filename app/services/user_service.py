@@ -1,51 +1,112 @@
+import logging
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy import insert, select, update, event
 
+from app.db.errors import violated_constraint
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import SecurityUtils
+from app.core.cache import principal_cache
+from app.core.admission import hash_gate
 
-class UserService:
-    async def get_by_username(self, db: AsyncSession, username: str):
-        result = await db.execute(select(User).where(User.username == username))
-        return result.scalar_one_or_none()
+logger = logging.getLogger(__name__)
 
-    async def get_by_email(self, db: AsyncSession, email: str):
-        result = await db.execute(select(User).where(User.email == email))
-        return result.scalar_one_or_none()
-    
+# Unique indexes of users -> field reported as already registered
+DUPLICATE_FIELDS = {
+    "uq_users_email_lower": "Email",
+    "ix_users_username": "Username",
+}
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target: User) -> None:
+    """
+    Bump the cached principal's version whenever a user row is flushed.
+    """
+    principal_cache.bump(target.user_id)
+
+    # Bump again once committed, in case a reader cached the old row in between
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.user_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session: Session) -> None:
+    for user_id in session.info.pop("changed_user_ids", ()):
+        principal_cache.bump(user_id)
+
+class UserService:
     async def get_by_user_id(self, db: AsyncSession, user_id: int):
         result = await db.execute(select(User).where(User.user_id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_login_credentials(self, db: AsyncSession, username: str):
+        """
+        Fetch only the columns needed to verify a login (user_id, password).
+        """
+        stmt = select(User.user_id, User.password).where(User.username == username)
+        result = await db.execute(stmt)
+        return result.one_or_none()
+
+    async def rehash_password(self, db: AsyncSession, user_id: int, old_hash: str, plain_password: str) -> None:
+        """
+        Replace a password hash made with outdated Argon2 parameters.
+        Runs as a background task after the login response has been sent.
+        """
+        # 1. Hash with the configured parameters; skip it when hashing is saturated
+        try:
+            async with hash_gate.slot():
+                new_hash = await SecurityUtils.get_hashed_token_async(plain_password)
+        except HTTPException:
+            return
+
+        # 2. Only replace the hash that was verified, never a newer password
+        stmt = (
+            update(User).
+            where(User.user_id == user_id, User.password == old_hash).
+            values(password=new_hash)
+        )
+
+        try:
+            await db.execute(stmt)
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+            logger.warning("Rehashing the password of user %s failed", user_id, exc_info=True)
+            return
+
+        # Bulk UPDATEs skip the mapper events, so drop the cached principal here
+        principal_cache.bump(user_id)
+
     async def create_user(self, db: AsyncSession, user_in: UserCreate) -> User:
         
-        # 1. Check if duplicate email/username
-        if await self.get_by_email(db, user_in.email):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, 
-                detail="Email already registered"
-                )
-        
-        if await self.get_by_username(db, user_in.username):
+        # 1. Get hashed password
+        async with hash_gate.slot():
+            hashed_pw = await SecurityUtils.get_hashed_token_async(user_in.password)
+
+        # 2. Insert and return the new row in one statement; the unique indexes
+        #    on lower(email) and username reject duplicates
+        stmt = (
+            insert(User).
+            values(email=user_in.email, username=user_in.username, password=hashed_pw).
+            returning(User)
+        )
+
+        try:
+            new_user = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            field = DUPLICATE_FIELDS.get(violated_constraint(e))
+            if field is None:
+                raise
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, 
-                detail="Username already registered"
+                detail=f"{field} already registered"
                 )
-
-        # 2. Get hashed password
-        hashed_pw = SecurityUtils.get_hashed_token(user_in.password)
-
-        # 3. Create a new user db
-        new_user = User(
-            email=user_in.email,
-            username=user_in.username,
-            password=hashed_pw
-        )
-        
-        db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
         
-        return new_user
\ No newline at end of file
+        return new_user
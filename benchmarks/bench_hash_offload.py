@@ -0,0 +1,98 @@
+"""
+Benchmark: /api/v1/keys/protected-api latency while logins are in flight.
+
+Each login runs a full Argon2 verification. With hashing on the event loop every
+in-flight login stalls the key checks served by the same worker; with the hash
+executor they keep flowing.
+
+Usage (needs the same environment variables as the app, e.g. a .env file):
+    python -m benchmarks.bench_hash_offload --mode inline      # before
+    python -m benchmarks.bench_hash_offload --mode executor    # after
+"""
+import json
+import time
+import asyncio
+import argparse
+
+from app.core.security import SecurityUtils, shutdown_hash_executor
+from benchmarks.harness import in_process_client, summarize
+
+USER = {"email": "bench@example.com", "username": "bench01", "password": "password123"}
+
+
+def use_inline_hashing() -> None:
+    """
+    Restore the pre-executor behaviour: hash directly on the event loop.
+    """
+    async def get_hashed_token_async(plain_password):
+        return SecurityUtils.get_hashed_token(plain_password)
+
+    async def verify_token_async(plain_password, hashed_password):
+        return SecurityUtils.verify_token(plain_password, hashed_password)
+
+    SecurityUtils.get_hashed_token_async = staticmethod(get_hashed_token_async)
+    SecurityUtils.verify_token_async = staticmethod(verify_token_async)
+
+
+async def run(logins: int, duration: float) -> dict:
+    async with in_process_client() as client:
+        # 1. Seed one user and one key, warm the key cache
+        await client.post("/api/v1/auth/register", json=USER)
+        login_body = {"username": USER["username"], "password": USER["password"]}
+        token = (await client.post("/api/v1/auth/login", json=login_body)).json()["access_token"]
+        key = (await client.post(
+            "/api/v1/keys/create",
+            json={"label": "bench"},
+            headers={"Authorization": f"Bearer {token}"},
+        )).json()["key"]
+        key_header = {"X-API-Key": key}
+        await client.get("/api/v1/keys/protected-api", headers=key_header)
+
+        # 2. Drive logins and probe key checks concurrently
+        deadline = time.perf_counter() + duration
+        latencies = []
+        completed_logins = 0
+
+        async def login_worker():
+            nonlocal completed_logins
+            while time.perf_counter() < deadline:
+                await client.post("/api/v1/auth/login", json=login_body)
+                completed_logins += 1
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/api/v1/keys/protected-api", headers=key_header)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(probe(), *(login_worker() for _ in range(logins)))
+
+    shutdown_hash_executor()
+
+    return {
+        "concurrent_logins": logins,
+        "duration_s": duration,
+        "logins_completed": completed_logins,
+        "probe_requests": len(latencies),
+        "probe_latency_ms": summarize(latencies, digits=2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inline", "executor"], default="executor")
+    parser.add_argument("--logins", type=int, default=4, help="concurrent login loops")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load")
+    args = parser.parse_args()
+
+    if args.mode == "inline":
+        use_inline_hashing()
+
+    result = asyncio.run(run(logins=args.logins, duration=args.duration))
+    result["mode"] = args.mode
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
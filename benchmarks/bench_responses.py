@@ -0,0 +1,131 @@
+"""
+Micro-benchmarks for rendering the hot JSON responses.
+
+Compares, for /users/me and the API key listing at several list sizes, the
+default FastAPI path (response_model validation from attributes, dump to
+JSON-compatible Python, stdlib json encoding) with the FAST_JSON_RESPONSES
+path (attributes dumped straight to JSON by a precompiled TypedDict adapter).
+Rows are plain objects shaped like the ORM results. Summaries are in
+microseconds per response.
+
+Usage (needs the same environment variables as the app, e.g. a .env file):
+    python -m benchmarks.bench_responses --output results.json
+    python -m benchmarks.bench_responses --sizes 1 100 --repeat 20
+"""
+import sys
+import json
+import argparse
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core import responses
+from app.core.responses import FastJSONResponse, list_response, model_response
+from app.schemas.user import UserResponse, USER_RESPONSE
+from app.schemas.apikey import APIKeyInfo, APIKEY_INFO_LIST
+from benchmarks.bench_security import environment, measure
+
+LIST_SIZES = (1, 100, 10000)
+
+Case = Tuple[str, Dict[str, Any], Callable[[], Any]]
+
+
+def make_user() -> SimpleNamespace:
+    return SimpleNamespace(
+        user_id=1,
+        username="benchuser",
+        email="bench@example.com",
+        points=120,
+        rank="Bronze",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def make_keys(count: int) -> List[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            key_id=i,
+            label=f"key-{i}",
+            description="benchmark key",
+            is_active=True,
+            created_at=now,
+            last_used_at=now if i % 2 else None,
+            rate_limit_per_minute=None,
+            daily_quota=1000,
+        )
+        for i in range(count)
+    ]
+
+
+def validated(adapter: TypeAdapter, value: Any) -> bytes:
+    # What FastAPI does with a response_model: validate, dump, encode
+    content = adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")
+    return JSONResponse(content).body
+
+
+def user_cases() -> Iterator[Case]:
+    user = make_user()
+    adapter = TypeAdapter(UserResponse)
+
+    yield "users_me", {"path": "validated"}, lambda: validated(adapter, user)
+    yield "users_me", {"path": "fast"}, lambda: model_response(USER_RESPONSE, UserResponse, user).body
+
+
+def listing_cases(sizes: List[int]) -> Iterator[Case]:
+    adapter = TypeAdapter(List[APIKeyInfo])
+
+    for size in sizes:
+        keys = make_keys(size)
+        yield "apikey_list", {"size": size, "path": "validated"}, lambda keys=keys: validated(adapter, keys)
+        yield "apikey_list", {"size": size, "path": "fast"}, lambda keys=keys: list_response(APIKEY_INFO_LIST, APIKeyInfo, keys).body
+
+
+def encoder_cases(sizes: List[int]) -> Iterator[Case]:
+    # The default response class alone, for routes without a fast path
+    adapter = TypeAdapter(List[APIKeyInfo])
+
+    for size in sizes:
+        content = adapter.dump_python(adapter.validate_python(make_keys(size), from_attributes=True), mode="json")
+        yield "encode", {"size": size, "class": "JSONResponse"}, lambda content=content: JSONResponse(content).body
+        yield "encode", {"size": size, "class": "FastJSONResponse"}, lambda content=content: FastJSONResponse(content).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(LIST_SIZES), help="API key list sizes (default 1 100 10000)")
+    parser.add_argument("--repeat", type=int, default=10, help="timed repetitions per case")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls per case")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per repetition")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    cases = [*user_cases(), *listing_cases(args.sizes), *encoder_cases(args.sizes)]
+
+    results = []
+    for name, params, fn in cases:
+        result = {"name": name, "params": params, **measure(fn, args.warmup, args.repeat, args.min_time)}
+        results.append(result)
+
+        stats = result["us_per_call"]
+        print(f"{name:<12} {json.dumps(params):<50} median {stats['p50']:>12.3f} us  stdev {stats['stdev']:.3f}", file=sys.stderr)
+
+    report = {
+        "environment": {**environment(), "encoder": "orjson" if responses.orjson is not None else "pydantic-core"},
+        "settings": {"sizes": args.sizes, "repeat": args.repeat, "warmup": args.warmup, "min_time": args.min_time},
+        "results": results,
+    }
+    rendered = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(rendered + "\n")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Micro-benchmarks for the SecurityUtils primitives.
+
+Times Argon2 hash/verify across cost parameters, JWT encode/decode across
+algorithms and claim sizes, and the API key digest/parse helpers. Every case is
+warmed up, then repeated; each repetition times enough calls to last at least
+--min-time seconds and records the mean per-call time. Summaries are in
+microseconds.
+
+Usage (needs the same environment variables as the app, e.g. a .env file):
+    python -m benchmarks.bench_security --output results.json
+    python -m benchmarks.bench_security --filter jwt --repeat 20
+    python -m benchmarks.bench_security --quick
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime, timezone
+from importlib.metadata import version
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from jose import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from app.core.config import settings
+from app.core.security import SecurityUtils
+from benchmarks.harness import summarize
+
+PASSWORD = "correct horse battery staple"
+
+# (time_cost, memory_cost KiB, parallelism)
+ARGON2_PARAMS = [(2, 19456, 1), (3, 65536, 4), (4, 65536, 4), (3, 102400, 4)]
+ARGON2_PARAMS_QUICK = [(2, 19456, 1), (3, 65536, 4)]
+
+JWT_ALGORITHMS = ("HS256", "HS384", "HS512", "ES256")
+
+# Padding added to the standard claims, in bytes
+CLAIM_SIZES = {"small": 0, "medium": 512, "large": 4096}
+
+Case = Tuple[str, Dict[str, Any], Callable[[], Any]]
+
+
+def argon2_cases(params: List[Tuple[int, int, int]]) -> Iterator[Case]:
+    configured = SecurityUtils.pwd_context
+    yield from _argon2_pair({"config": "current"}, configured)
+
+    for time_cost, memory_cost, parallelism in params:
+        context = configured.copy(
+            argon2__time_cost=time_cost,
+            argon2__memory_cost=memory_cost,
+            argon2__parallelism=parallelism,
+        )
+        yield from _argon2_pair(
+            {"time_cost": time_cost, "memory_cost": memory_cost, "parallelism": parallelism},
+            context,
+        )
+
+
+def _argon2_pair(params: Dict[str, Any], context) -> Iterator[Case]:
+    hashed = context.hash(PASSWORD)
+    yield "argon2_hash", params, lambda: context.hash(PASSWORD)
+    yield "argon2_verify", params, lambda: context.verify(PASSWORD, hashed)
+
+
+def jwt_cases() -> Iterator[Case]:
+    # Same call path as the app: SECRET_KEY, or the ES256 keyring when configured
+    token = SecurityUtils.create_access_token({"sub": "42"})
+    algorithm = jwt.get_unverified_header(token)["alg"]
+    yield "create_access_token", {"algorithm": algorithm}, lambda: SecurityUtils.create_access_token({"sub": "42"})
+    yield "jwt_decode", {"algorithm": algorithm, "claims": "app"}, lambda: SecurityUtils.decode_access_token(token)
+
+    for algorithm in JWT_ALGORITHMS:
+        signing_key, verifying_key = _jwt_keys(algorithm)
+
+        for size_name, padding in CLAIM_SIZES.items():
+            claims = {"sub": "42", "exp": int(time.time()) + 3600}
+            if padding:
+                claims["pad"] = "x" * padding
+
+            encoded = jwt.encode(claims, signing_key, algorithm=algorithm)
+            params = {"algorithm": algorithm, "claims": size_name, "token_bytes": len(encoded)}
+
+            yield "jwt_encode", params, lambda c=claims, k=signing_key, a=algorithm: jwt.encode(c, k, algorithm=a)
+            yield "jwt_decode", params, lambda t=encoded, k=verifying_key, a=algorithm: jwt.decode(t, k, algorithms=[a])
+
+
+def _jwt_keys(algorithm: str) -> Tuple[str, str]:
+    if algorithm.startswith("HS"):
+        return settings.SECRET_KEY, settings.SECRET_KEY
+
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+    return private_pem, public_pem
+
+
+def apikey_cases() -> Iterator[Case]:
+    key, _ = SecurityUtils.create_api_key("test")
+    yield "create_api_key", {}, lambda: SecurityUtils.create_api_key("test")
+    yield "apikey_digest", {}, lambda: SecurityUtils.get_apikey_digest(key)
+    yield "parse_api_key", {}, lambda: SecurityUtils.parse_api_key(key)
+
+
+def measure(fn: Callable[[], Any], warmup: int, repeat: int, min_time: float) -> Dict[str, Any]:
+    """
+    Per-call timings in microseconds, one sample per repetition.
+    """
+    for _ in range(warmup):
+        fn()
+
+    # Calls per repetition, doubled until a repetition lasts min_time
+    number = 1
+    while True:
+        elapsed = _time_calls(fn, number)
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    samples = [_time_calls(fn, number) / number * 1e6 for _ in range(repeat)]
+
+    return {"calls_per_repeat": number, "us_per_call": summarize(samples, digits=3)}
+
+
+def _time_calls(fn: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "packages": {name: version(name) for name in ("passlib", "argon2-cffi", "python-jose", "cryptography")},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="timed repetitions per case")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls per case")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per repetition")
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    parser.add_argument("--quick", action="store_true", help="fewer Argon2 parameter sets")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    cases = [
+        *argon2_cases(ARGON2_PARAMS_QUICK if args.quick else ARGON2_PARAMS),
+        *jwt_cases(),
+        *apikey_cases(),
+    ]
+
+    results = []
+    for name, params, fn in cases:
+        if args.filter and args.filter not in name:
+            continue
+
+        result = {"name": name, "params": params, **measure(fn, args.warmup, args.repeat, args.min_time)}
+        results.append(result)
+
+        stats = result["us_per_call"]
+        print(f"{name:<20} {json.dumps(params):<60} median {stats['p50']:>12.3f} us  stdev {stats['stdev']:.3f}", file=sys.stderr)
+
+    report = {
+        "environment": environment(),
+        "settings": {"repeat": args.repeat, "warmup": args.warmup, "min_time": args.min_time},
+        "results": results,
+    }
+    rendered = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(rendered + "\n")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import os
+import math
+import logging
+import shutil
+import tempfile
+import statistics
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Sequence
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[float], digits: int = 3) -> Dict[str, float]:
+    """
+    Summary statistics of a list of timings (any unit).
+    """
+    if not samples:
+        return {"count": 0}
+
+    return {
+        "count": len(samples),
+        "mean": round(statistics.fmean(samples), digits),
+        "stdev": round(statistics.stdev(samples), digits) if len(samples) > 1 else 0.0,
+        "min": round(min(samples), digits),
+        "p50": round(percentile(samples, 50), digits),
+        "p95": round(percentile(samples, 95), digits),
+        "p99": round(percentile(samples, 99), digits),
+        "max": round(max(samples), digits),
+    }
+
+
+@asynccontextmanager
+async def in_process_client(timeout: Optional[float] = 60.0) -> AsyncIterator[AsyncClient]:
+    """
+    AsyncClient calling the app in-process over ASGI, backed by a throwaway
+    SQLite database instead of the configured PostgreSQL.
+    """
+    from app.main import app
+    from app.db.base import Base
+    from app.db.session import get_db
+    from app.core.access_log import access_logger
+    from app.core.ratelimit import login_limiter
+
+    # Keep stdout for the benchmark results
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    access_logger.disabled = True
+
+    # Every request comes from one client and a handful of users
+    limits = login_limiter.per_username, login_limiter.per_client
+    login_limiter.per_username = login_limiter.per_client = 0
+
+    tmp_dir = tempfile.mkdtemp(prefix="auth-bench-")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        access_logger.disabled = False
+        login_limiter.per_username, login_limiter.per_client = limits
+        await engine.dispose()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,279 @@
+"""
+Load test: throughput and latency of the auth endpoints under concurrent traffic.
+
+Seeds --users users with --keys API keys each through the public API, then runs
+every scenario for --duration seconds with --concurrency workers:
+
+    login          POST /api/v1/auth/login          (Argon2 verification)
+    users_me       GET  /api/v1/users/me            (bearer token)
+    protected_api  GET  /api/v1/keys/protected-api  (API key)
+    keys_create    POST /api/v1/keys/create         (key generation + insert)
+
+By default the app runs in-process over ASGI against a throwaway SQLite database.
+Pass --url to load a running server instead (e.g. a local uvicorn on PostgreSQL).
+The load comes from one client and a handful of users, so that server must run
+without rate limits:
+
+    LOGIN_RATE_LIMIT_PER_USERNAME=0 LOGIN_RATE_LIMIT_PER_CLIENT=0 \
+    APIKEY_DEFAULT_RATE_LIMIT_PER_MINUTE=0 APIKEY_DEFAULT_DAILY_QUOTA=0 \
+    uvicorn app.main:app
+
+A 429 response aborts the run with a message saying so.
+
+Results are printed as JSON. --save-baseline stores them; --baseline compares a
+run against a stored one and exits with status 1 when a scenario regressed by
+more than --tolerance (throughput down or p95 latency up).
+
+Usage (needs the same environment variables as the app, e.g. a .env file):
+    python -m benchmarks.load_test --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load_test --baseline benchmarks/baseline.json
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --concurrency 32
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import secrets
+import argparse
+import itertools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from httpx import AsyncClient, Limits, Response
+
+from benchmarks.harness import in_process_client, summarize
+
+SCENARIOS = ("login", "users_me", "protected_api", "keys_create")
+PASSWORD = "password123"
+
+
+class RateLimited(RuntimeError):
+    """
+    The target server throttled the load; its numbers would measure the limiter.
+    """
+
+
+class Fixtures:
+    """
+    Seeded users, tokens and keys shared by the scenarios.
+    """
+
+    def __init__(self):
+        self.logins: List[Dict[str, str]] = []
+        self.tokens: List[str] = []
+        self.keys: List[str] = []
+        self.labels = itertools.count()
+        self.run_id = secrets.token_hex(3)
+
+
+async def seed(client: AsyncClient, users: int, keys: int) -> Fixtures:
+    """
+    Register users, log them in and create their keys through the API.
+    """
+    fixtures = Fixtures()
+
+    for i in range(users):
+        # Unique per run so a persistent database can be loaded repeatedly
+        username = f"lt{fixtures.run_id}{i:05d}"
+        login = {"username": username, "password": PASSWORD}
+
+        _expect_ok(await client.post(
+            "/api/v1/auth/register",
+            json={"email": f"{username}@example.com", **login},
+        ))
+        token = _expect_ok(await client.post("/api/v1/auth/login", json=login)).json()["access_token"]
+
+        fixtures.logins.append(login)
+        fixtures.tokens.append(token)
+
+        for j in range(keys):
+            response = await client.post(
+                "/api/v1/keys/create",
+                json={"label": f"seed{j}"},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            fixtures.keys.append(_expect_ok(response).json()["key"])
+
+    return fixtures
+
+
+def build_scenario(name: str, client: AsyncClient, fixtures: Fixtures) -> Callable[[], Awaitable[Response]]:
+    if name == "login":
+        return lambda: client.post("/api/v1/auth/login", json=random.choice(fixtures.logins))
+
+    if name == "users_me":
+        return lambda: client.get(
+            "/api/v1/users/me",
+            headers={"Authorization": f"Bearer {random.choice(fixtures.tokens)}"},
+        )
+
+    if name == "protected_api":
+        return lambda: client.get(
+            "/api/v1/keys/protected-api",
+            headers={"X-API-Key": random.choice(fixtures.keys)},
+        )
+
+    if name == "keys_create":
+        return lambda: client.post(
+            "/api/v1/keys/create",
+            json={"label": f"load{next(fixtures.labels)}"},
+            headers={"Authorization": f"Bearer {random.choice(fixtures.tokens)}"},
+        )
+
+    raise ValueError(f"Unknown scenario {name}")
+
+
+async def run_scenario(request: Callable[[], Awaitable[Response]], concurrency: int, duration: float) -> Dict:
+    """
+    Run `concurrency` closed-loop workers issuing `request` for `duration` seconds.
+    """
+    latencies: List[float] = []
+    errors = 0
+
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await request()
+            except Exception:
+                failed = True
+            else:
+                failed = _check_rate_limit(response).status_code >= 400
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "latency_ms": summarize(latencies, digits=2),
+    }
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Regressions of `result` against `baseline`, as human-readable lines.
+    """
+    regressions = []
+
+    for name, current in result["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']} rps < baseline {previous['throughput_rps']} rps"
+            )
+
+        current_p95 = current["latency_ms"].get("p95")
+        previous_p95 = previous["latency_ms"].get("p95")
+        if current_p95 is not None and previous_p95 is not None and current_p95 > previous_p95 * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current_p95} ms > baseline {previous_p95} ms")
+
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors (baseline {previous['errors']})")
+
+    return regressions
+
+
+@asynccontextmanager
+async def open_client(url: Optional[str]) -> AsyncIterator[AsyncClient]:
+    if url is None:
+        async with in_process_client() as client:
+            yield client
+        return
+
+    limits = Limits(max_connections=None, max_keepalive_connections=None)
+    async with AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        yield client
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    async with open_client(args.url) as client:
+        # 1. Seed users and keys
+        fixtures = await seed(client, users=args.users, keys=args.keys)
+
+        # 2. Run each scenario in isolation
+        scenarios = {}
+        for name in args.scenarios:
+            request = build_scenario(name, client, fixtures)
+            await run_scenario(request, concurrency=args.concurrency, duration=args.warmup)
+            scenarios[name] = await run_scenario(request, concurrency=args.concurrency, duration=args.duration)
+
+    return {
+        "target": args.url or "in-process",
+        "users": args.users,
+        "keys_per_user": args.keys,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "scenarios": scenarios,
+    }
+
+
+def _check_rate_limit(response: Response) -> Response:
+    if response.status_code == 429:
+        raise RateLimited(
+            f"{response.request.method} {response.request.url} -> 429 {response.text}\n"
+            "The target server is rate limiting the load test. Restart it with "
+            "LOGIN_RATE_LIMIT_PER_USERNAME=0 LOGIN_RATE_LIMIT_PER_CLIENT=0 "
+            "APIKEY_DEFAULT_RATE_LIMIT_PER_MINUTE=0 APIKEY_DEFAULT_DAILY_QUOTA=0."
+        )
+    return response
+
+
+def _expect_ok(response: Response) -> Response:
+    _check_rate_limit(response)
+    if response.status_code >= 400:
+        raise RuntimeError(f"Seeding failed: {response.request.method} {response.request.url} -> {response.status_code} {response.text}")
+    return response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: in-process ASGI)")
+    parser.add_argument("--users", type=int, default=10, help="users to seed")
+    parser.add_argument("--keys", type=int, default=2, help="API keys to seed per user")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent workers per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds of unmeasured load per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store the results as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (default 0.2)")
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(run(args))
+    except RateLimited as e:
+        sys.exit(f"error: {e}")
+
+    rendered = json.dumps(result, indent=2)
+    print(rendered)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            f.write(rendered + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
+from app.core.cache import verified_key_cache, principal_cache, jwt_claims_cache
+from app.services.usage_buffer import key_usage_buffer
+from app.core.ratelimit import login_limiter, apikey_limiter
 
 # -------------------------CONFIGURATION------------------------- #
 
@@ -40,6 +44,38 @@ async def override_get_db():
         yield session
 
 # --------------------------- FIXTURES --------------------------- #
+@pytest.fixture
+def session_factory():
+    """
+    Session factory bound to the test database, for seeding or inspecting rows directly.
+    """
+    return TestingAsyncSession
+
+class QueryCounter:
+    """
+    Records every SQL statement sent to the test database.
+    """
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+@pytest.fixture
+def query_counter():
+    counter = QueryCounter()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
 @pytest.fixture(scope="function")
 async def client():
     """
@@ -56,6 +92,14 @@ async def client():
     # SWAP: Replace the real DB connection with the mock DB
     app.dependency_overrides[get_db] = override_get_db
 
+    # RESET: In-process caches must not leak rows between test databases
+    verified_key_cache.clear()
+    principal_cache.clear()
+    jwt_claims_cache.clear()
+    key_usage_buffer.clear()
+    await login_limiter.store.clear()
+    apikey_limiter.clear()
+
     # 2. EXECUTE TEST
     # Use ASGITransport to call the app directly (in-memory), bypassing network layers
     transport = ASGITransport(app=app)
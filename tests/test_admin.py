@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+
+ADMIN_TOKEN = "admin-token-for-tests"
+
+user_data = {
+    "email": "test@example.com",
+    "username": "tester01",
+    "password": "password123",
+}
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", ADMIN_TOKEN)
+    return {"X-Admin-Token": ADMIN_TOKEN}
+
+@pytest.fixture
+async def seeded(client: AsyncClient):
+    await client.post("/api/v1/auth/register", json=user_data)
+    login_res = await client.post("/api/v1/auth/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+    payload = [{"label": f"export{i}"} for i in range(5)]
+    await client.post("/api/v1/keys/bulk-create", json=payload, headers=headers)
+
+def parse_ndjson(text: str):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_export_requires_admin_token(client: AsyncClient, admin_headers):
+    response = await client.get("/api/v1/admin/export/users", headers={"X-Admin-Token": "wrong"})
+
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_export_disabled_without_configured_token(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", None)
+
+    response = await client.get("/api/v1/admin/export/users", headers={"X-Admin-Token": ""})
+
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_export_users_without_secrets(client: AsyncClient, admin_headers, seeded):
+    response = await client.get("/api/v1/admin/export/users", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "X-Export-Watermark" in response.headers
+
+    rows = parse_ndjson(response.text)
+    assert [row["username"] for row in rows] == [user_data["username"]]
+    assert "password" not in rows[0]
+
+@pytest.mark.asyncio
+async def test_export_apikeys_in_batches(client: AsyncClient, admin_headers, seeded):
+    response = await client.get("/api/v1/admin/export/apikeys", params={"batch_size": 2}, headers=admin_headers)
+
+    rows = parse_ndjson(response.text)
+
+    assert [row["label"] for row in rows] == [f"export{i}" for i in range(5)]
+    for secret in ("key", "key_digest", "lookup_id"):
+        assert secret not in rows[0]
+
+@pytest.mark.asyncio
+async def test_export_incremental_since(client: AsyncClient, admin_headers, seeded):
+    response = await client.get(
+        "/api/v1/admin/export/apikeys",
+        params={"since": "2999-01-01T00:00:00"},
+        headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    assert response.text == ""
+
+    response = await client.get(
+        "/api/v1/admin/export/apikeys",
+        params={"since": "2000-01-01T00:00:00"},
+        headers=admin_headers
+    )
+
+    assert len(parse_ndjson(response.text)) == 5
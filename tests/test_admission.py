@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.core.admission import AdmissionGate, hash_gate
+
+
+@pytest.mark.asyncio
+async def test_gate_sheds_after_max_queue_wait():
+    gate = AdmissionGate(max_concurrency=1, max_queue_wait=0.05, retry_after=3)
+    release = asyncio.Event()
+
+    async def hold():
+        async with gate.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        async with gate.slot():
+            pass
+
+    release.set()
+    await holder
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "3"
+    assert gate.rejected == 1
+    assert gate.waiting == 0 and gate.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_gate_admits_waiter_when_slot_frees():
+    gate = AdmissionGate(max_concurrency=1, max_queue_wait=1.0, retry_after=1)
+
+    async def work():
+        async with gate.slot():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(work(), work(), work())
+
+    assert gate.admitted == 3
+    assert gate.rejected == 0
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_hashing_saturated(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(hash_gate, "max_queue_wait", 0.01)
+
+    user = {"email": "busy@example.com", "username": "busyuser", "password": "password123"}
+    await client.post("/api/v1/auth/register", json=user)
+
+    # Occupy every slot
+    release = asyncio.Event()
+    entered = asyncio.Event()
+
+    async def hold():
+        async with hash_gate.slot():
+            entered.set()
+            await release.wait()
+
+    holders = [asyncio.create_task(hold()) for _ in range(hash_gate.max_concurrency)]
+    await entered.wait()
+
+    try:
+        response = await client.post("/api/v1/auth/login", json={"username": user["username"], "password": user["password"]})
+    finally:
+        release.set()
+        await asyncio.gather(*holders)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(hash_gate.retry_after)
@@ -253,6 +253,12 @@ async def test_validate_apikey_success(client: AsyncClient, auth_headers):
     data = response.json()
     assert "last_used_at" in data
 
+    # Secret-derived columns are not exposed, neither from the DB nor from the cache
+    cached = (await client.get("/api/v1/keys/protected-api", headers=response.request.headers)).json()
+    for field in ("key", "key_digest", "lookup_id", "prefix"):
+        assert field not in data
+        assert field not in cached
+
 
 # --- EDGE CASE ---
 @pytest.mark.asyncio
@@ -288,6 +294,32 @@ async def test_create_apikey_duplicate_label(client: AsyncClient, auth_headers):
     data = response.json()
     assert data["detail"] == f"API key label '{apikey_payload["label"]}' already exists."
 
+@pytest.mark.asyncio
+async def test_create_apikey_concurrent_duplicate_label(client: AsyncClient, auth_headers, session_factory):
+    from types import SimpleNamespace
+    from fastapi import HTTPException
+    from app.services.api_service import APIService
+
+    await client.post("/api/v1/keys/create", json={"label": "raced"}, headers=auth_headers)
+    me = await client.get("/api/v1/users/me", headers=auth_headers)
+
+    async with session_factory() as session:
+        execute = session.execute
+
+        # The duplicate check runs before the other request commits the label
+        async def label_check_misses(*args, **kwargs):
+            session.execute = execute
+            return SimpleNamespace(scalar_one_or_none=lambda: None)
+
+        session.execute = label_check_misses
+
+        with pytest.raises(HTTPException) as error:
+            await APIService().create_apikey(session, me.json()["user_id"], {"label": "raced"})
+
+    # The unique constraint violation is the same 400 as a detected duplicate
+    assert error.value.status_code == 400
+    assert error.value.detail == "API key label 'raced' already exists."
+
 @pytest.mark.asyncio
 async def test_read_aipkey_empty(client: AsyncClient, auth_headers):
     # Retrive all apikey
@@ -296,12 +328,10 @@ async def test_read_aipkey_empty(client: AsyncClient, auth_headers):
         headers=auth_headers
     )
 
-    # Verify status code
-    assert response.status_code == 404, f"Error:{response.text}"
-
-    # Check response message
-    data = response.json()
-    assert data["detail"] == "No API keys found."
+    # Verify status code: an empty page is not an error
+    assert response.status_code == 200, f"Error:{response.text}"
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
 
 @pytest.mark.asyncio
 async def test_delete_apikey_wrong_label(client: AsyncClient, auth_headers):
@@ -412,6 +442,20 @@ async def test_update_apikey_label_duplicate(client: AsyncClient, auth_headers):
     data = response.json()
     assert data["detail"] == f"APIKey with label '{apikey_1["label"]}' is already existed."
 
+@pytest.mark.asyncio
+async def test_update_apikey_null_fields_rejected(client: AsyncClient, auth_headers):
+    res = await client.post("/api/v1/keys/create", json={"label": "test01"}, headers=auth_headers)
+    key_id = res.json()["key_id"]
+
+    # label and is_active may be omitted but never set to null
+    for field in ("label", "is_active"):
+        response = await client.patch(f"/api/v1/keys/update/{key_id}", json={field: None}, headers=auth_headers)
+        assert response.status_code == 422, f"Error:{response.text}"
+
+    # Nullable fields can still be cleared
+    response = await client.patch(f"/api/v1/keys/update/{key_id}", json={"description": None}, headers=auth_headers)
+    assert response.status_code == 200, f"Error:{response.text}"
+
 @pytest.mark.asyncio
 async def test_update_apikey_status_redundant(client: AsyncClient, auth_headers):
     apikey_payload = {
@@ -554,4 +598,530 @@ async def test_validate_apikey_inactive(client: AsyncClient, auth_headers):
 
     # Check response message
     data = response.json()
-    assert data["detail"] == "API Key is inactive/revoked."
\ No newline at end of file
+    assert data["detail"] == "API Key is inactive/revoked."
+
+# --- VERIFIED KEY CACHE ---
+@pytest.mark.asyncio
+async def test_validate_apikey_cached(client: AsyncClient, auth_headers):
+    from app.core.cache import verified_key_cache
+
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01"},
+        headers=auth_headers
+    )
+    key_header = {"X-API-Key": res.json()["key"]}
+
+    # First call verifies the hash, second one is served from the cache
+    first = await client.get("/api/v1/keys/protected-api", headers=key_header)
+    hits_before = verified_key_cache.hits
+    second = await client.get("/api/v1/keys/protected-api", headers=key_header)
+
+    assert first.status_code == 200, f"Error:{first.text}"
+    assert second.status_code == 200, f"Error:{second.text}"
+    assert second.json()["key_id"] == first.json()["key_id"]
+    assert verified_key_cache.hits == hits_before + 1
+
+@pytest.mark.asyncio
+async def test_validate_apikey_cache_invalidated_on_revoke(client: AsyncClient, auth_headers):
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01"},
+        headers=auth_headers
+    )
+    key_data = res.json()
+    key_header = {"X-API-Key": key_data["key"]}
+
+    # Warm the cache
+    await client.get("/api/v1/keys/protected-api", headers=key_header)
+
+    # Revoke the key
+    await client.patch(
+        f"/api/v1/keys/update/{key_data['key_id']}",
+        json={"is_active": False},
+        headers=auth_headers
+    )
+
+    response = await client.get("/api/v1/keys/protected-api", headers=key_header)
+
+    assert response.status_code == 403, f"Error:{response.text}"
+
+@pytest.mark.asyncio
+async def test_validate_apikey_cache_invalidated_on_roll(client: AsyncClient, auth_headers):
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01"},
+        headers=auth_headers
+    )
+    key_data = res.json()
+    old_header = {"X-API-Key": key_data["key"]}
+
+    # Warm the cache, then roll the key
+    await client.get("/api/v1/keys/protected-api", headers=old_header)
+    rolled = await client.post(f"/api/v1/keys/roll/{key_data['key_id']}", headers=auth_headers)
+
+    old_response = await client.get("/api/v1/keys/protected-api", headers=old_header)
+    new_response = await client.get(
+        "/api/v1/keys/protected-api",
+        headers={"X-API-Key": rolled.json()["key"]}
+    )
+
+    assert old_response.status_code == 401, f"Error:{old_response.text}"
+    assert new_response.status_code == 200, f"Error:{new_response.text}"
+
+
+# --- KEY DIGEST MIGRATION ---
+@pytest.mark.asyncio
+async def test_validate_legacy_apikey_migrates_to_digest(client: AsyncClient, auth_headers, session_factory):
+    from sqlalchemy import select
+    from app.models.apikey import APIKey
+    from app.core.security import SecurityUtils
+
+    # Store a key the way it was stored before digests existed
+    legacy_key = f"sk_test_{SecurityUtils.create_api_token()}"
+    me = await client.get("/api/v1/users/me", headers=auth_headers)
+
+    async with session_factory() as session:
+        session.add(APIKey(
+            user_id=me.json()["user_id"],
+            prefix=legacy_key[:10],
+            key=SecurityUtils.get_hashed_token(legacy_key[10:]),
+            label="legacy",
+        ))
+        await session.commit()
+
+    response = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": legacy_key})
+
+    # Verify status code
+    assert response.status_code == 200, f"Error:{response.text}"
+
+    # The Argon2 hash is replaced by the digest on first successful use
+    async with session_factory() as session:
+        apikey_db = (await session.execute(select(APIKey).where(APIKey.label == "legacy"))).scalar_one()
+
+    assert apikey_db.key is None
+    assert apikey_db.key_digest == SecurityUtils.get_apikey_digest(legacy_key)
+
+@pytest.mark.asyncio
+async def test_validate_legacy_apikey_among_many_sharing_prefix(client: AsyncClient, auth_headers, session_factory):
+    from app.models.apikey import APIKey
+    from app.core.security import SecurityUtils
+    from app.core.admission import hash_gate
+
+    # Five unmigrated keys share one 10-character prefix
+    prefix = f"sk_test_{SecurityUtils.create_api_token()}"[:10]
+    legacy_keys = [prefix + SecurityUtils.create_api_token()[2:] for _ in range(5)]
+    me = await client.get("/api/v1/users/me", headers=auth_headers)
+
+    async with session_factory() as session:
+        session.add_all(
+            APIKey(
+                user_id=me.json()["user_id"],
+                prefix=prefix,
+                key=SecurityUtils.get_hashed_token(legacy_key[10:]),
+                label=f"legacy{i}",
+            )
+            for i, legacy_key in enumerate(legacy_keys)
+        )
+        await session.commit()
+
+    admitted_before = hash_gate.admitted
+    response = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": legacy_keys[-1]})
+
+    # The last candidate still verifies, each Argon2 verify admitted through hash_gate
+    assert response.status_code == 200, f"Error:{response.text}"
+    assert response.json()["label"] == "legacy4"
+    assert 1 <= hash_gate.admitted - admitted_before <= 5
+
+@pytest.mark.asyncio
+async def test_validate_apikey_checksum_mismatch(client: AsyncClient, auth_headers):
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01"},
+        headers=auth_headers
+    )
+    key = res.json()["key"]
+
+    # Change the last character of the checksum
+    typo_key = key[:-1] + ("0" if key[-1] != "0" else "1")
+
+    response = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": typo_key})
+
+    # Verify status code
+    assert response.status_code == 401, f"Error:{response.text}"
+    assert response.json()["detail"] == "Invalid or unauthorized access."
+
+
+# --- WRITE-BEHIND USAGE ---
+@pytest.mark.asyncio
+async def test_validate_apikey_usage_written_behind(client: AsyncClient, auth_headers, session_factory):
+    from app.models.apikey import APIKey
+    from app.services.usage_buffer import key_usage_buffer
+
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01"},
+        headers=auth_headers
+    )
+    key_data = res.json()
+
+    response = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": key_data["key"]})
+    assert response.json()["last_used_at"] is not None
+
+    # Nothing is written during the request itself
+    async with session_factory() as session:
+        apikey_db = await session.get(APIKey, key_data["key_id"])
+        assert apikey_db.last_used_at is None
+
+    # One flush writes every pending key
+    assert await key_usage_buffer.flush(session_factory) == 1
+
+    async with session_factory() as session:
+        apikey_db = await session.get(APIKey, key_data["key_id"])
+        assert apikey_db.last_used_at is not None
+
+
+@pytest.mark.asyncio
+async def test_usage_flush_in_batches(client: AsyncClient, auth_headers, session_factory, query_counter, monkeypatch):
+    from app.services.usage_buffer import key_usage_buffer
+
+    res = await client.post(
+        "/api/v1/keys/bulk-create",
+        json=[{"label": f"batch{i}"} for i in range(3)],
+        headers=auth_headers
+    )
+    for key_data in res.json():
+        await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": key_data["key"]})
+
+    monkeypatch.setattr(key_usage_buffer, "batch_size", 2)
+    query_counter.reset()
+
+    # 3 keys in batches of 2: two UPDATE statements
+    assert await key_usage_buffer.flush(session_factory) == 3
+    assert sum(statement.startswith("UPDATE apikeys") for statement in query_counter.statements) == 2
+
+@pytest.mark.asyncio
+async def test_usage_failed_flush_restores_at_most_max_pending():
+    from datetime import datetime, timezone
+    from app.services.usage_buffer import KeyUsageBuffer
+
+    class FailingSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt):
+            raise ConnectionError("database unavailable")
+
+    buffer = KeyUsageBuffer(flush_interval=60, max_pending=2)
+    now = datetime.now(timezone.utc)
+    for key_id in (1, 2, 3):
+        buffer.record(key_id, now, quota_day=now.date())
+
+    with pytest.raises(ConnectionError):
+        await buffer.flush(FailingSession)
+
+    # The next flush is no bigger than max_pending
+    assert len(buffer._pending) == 2
+    assert buffer.dropped == 1
+
+    # Quota counts of the kept keys survive for the next flush
+    assert set(buffer._quota_pending) == set(buffer._pending)
+
+
+# --- PER-KEY LIMITS ---
+@pytest.mark.asyncio
+async def test_validate_apikey_rate_limited(client: AsyncClient, auth_headers):
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01", "rate_limit_per_minute": 2},
+        headers=auth_headers
+    )
+    key_header = {"X-API-Key": res.json()["key"]}
+
+    first = await client.get("/api/v1/keys/protected-api", headers=key_header)
+    second = await client.get("/api/v1/keys/protected-api", headers=key_header)
+    third = await client.get("/api/v1/keys/protected-api", headers=key_header)
+
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+    assert second.headers["RateLimit-Remaining"] == "0"
+
+    # Verify status code & headers
+    assert third.status_code == 429, f"Error:{third.text}"
+    assert third.headers["RateLimit-Remaining"] == "0"
+    assert int(third.headers["Retry-After"]) >= 1
+
+@pytest.mark.asyncio
+async def test_daily_quota_survives_restart(client: AsyncClient, auth_headers, session_factory):
+    from app.models.apikey import APIKey
+    from app.core.cache import verified_key_cache
+    from app.core.ratelimit import apikey_limiter
+    from app.services.usage_buffer import key_usage_buffer
+
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01"},
+        headers=auth_headers
+    )
+    key_data = res.json()
+    key_header = {"X-API-Key": key_data["key"]}
+
+    # Set the quota through the update endpoint
+    await client.patch(f"/api/v1/keys/update/{key_data['key_id']}", json={"daily_quota": 2}, headers=auth_headers)
+
+    assert (await client.get("/api/v1/keys/protected-api", headers=key_header)).status_code == 200
+    assert (await client.get("/api/v1/keys/protected-api", headers=key_header)).status_code == 200
+    assert (await client.get("/api/v1/keys/protected-api", headers=key_header)).status_code == 429
+
+    # Persist the counter, then drop all in-memory state as a restart would
+    await key_usage_buffer.flush(session_factory)
+
+    async with session_factory() as session:
+        apikey_db = await session.get(APIKey, key_data["key_id"])
+        assert apikey_db.quota_used == 2
+        assert apikey_db.quota_day is not None
+
+    apikey_limiter.clear()
+    verified_key_cache.clear()
+
+    response = await client.get("/api/v1/keys/protected-api", headers=key_header)
+
+    assert response.status_code == 429, f"Error:{response.text}"
+    assert response.json()["detail"] == "Daily quota exceeded for this API key."
+
+@pytest.mark.asyncio
+async def test_apikey_owner_cannot_raise_or_remove_limit(client: AsyncClient, auth_headers, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "APIKEY_DEFAULT_RATE_LIMIT_PER_MINUTE", 2)
+
+    # 0 (unlimited) is rejected outright
+    unlimited = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01", "rate_limit_per_minute": 0},
+        headers=auth_headers
+    )
+    assert unlimited.status_code == 422
+
+    # A higher limit is clamped to the server default
+    res = await client.post(
+        "/api/v1/keys/create",
+        json={"label": "test01", "rate_limit_per_minute": 1000},
+        headers=auth_headers
+    )
+    key_data = res.json()
+    key_header = {"X-API-Key": key_data["key"]}
+
+    update = await client.patch(f"/api/v1/keys/update/{key_data['key_id']}", json={"daily_quota": 0}, headers=auth_headers)
+    assert update.status_code == 422
+
+    first = await client.get("/api/v1/keys/protected-api", headers=key_header)
+    await client.get("/api/v1/keys/protected-api", headers=key_header)
+    third = await client.get("/api/v1/keys/protected-api", headers=key_header)
+
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert third.status_code == 429, f"Error:{third.text}"
+
+
+@pytest.mark.asyncio
+async def test_daily_quota_persisted_across_flush_batches(client: AsyncClient, auth_headers, session_factory, monkeypatch):
+    from sqlalchemy import select
+    from app.models.apikey import APIKey
+    from app.services.usage_buffer import key_usage_buffer
+
+    res = await client.post(
+        "/api/v1/keys/bulk-create",
+        json=[{"label": f"quota{i}", "daily_quota": 10} for i in range(3)],
+        headers=auth_headers
+    )
+    for key_data in res.json():
+        for _ in range(2):
+            await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": key_data["key"]})
+
+    # Every batch carries the quota increments of its own keys
+    monkeypatch.setattr(key_usage_buffer, "batch_size", 2)
+    assert await key_usage_buffer.flush(session_factory) == 3
+
+    async with session_factory() as session:
+        counts = (await session.execute(select(APIKey.quota_used))).scalars().all()
+
+    assert counts == [2, 2, 2]
+
+
+# --- BULK CREATE ---
+@pytest.mark.asyncio
+async def test_bulk_create_apikeys_success(client: AsyncClient, auth_headers):
+    payload = [{"label": f"bulk{i}", "description": "batch"} for i in range(5)]
+
+    response = await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+
+    # Verify status code
+    assert response.status_code == 201, f"Error:{response.text}"
+
+    data = response.json()
+    assert [item["label"] for item in data] == [item["label"] for item in payload]
+    assert len({item["key"] for item in data}) == 5
+
+    # Every returned key works
+    for item in data:
+        res = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": item["key"]})
+        assert res.status_code == 200
+        assert res.json()["key_id"] == item["key_id"]
+
+@pytest.mark.asyncio
+async def test_bulk_create_apikeys_existing_label(client: AsyncClient, auth_headers):
+    await client.post("/api/v1/keys/create", json={"label": "bulk1"}, headers=auth_headers)
+
+    payload = [{"label": "bulk0"}, {"label": "bulk1"}]
+    response = await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+
+    # Verify status code & nothing was created
+    assert response.status_code == 400, f"Error:{response.text}"
+    assert response.json()["detail"] == "API key labels already exist: bulk1."
+
+    keys = await client.get("/api/v1/keys/", headers=auth_headers)
+    assert [item["label"] for item in keys.json()] == ["bulk1"]
+
+@pytest.mark.asyncio
+async def test_bulk_create_apikeys_repeated_label(client: AsyncClient, auth_headers):
+    payload = [{"label": "bulk0"}, {"label": "bulk0"}]
+    response = await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+
+    assert response.status_code == 400, f"Error:{response.text}"
+    assert response.json()["detail"] == "Duplicate API key labels in request: bulk0."
+
+
+# --- BULK REVOKE / DELETE ---
+@pytest.fixture
+async def bulk_keys(client: AsyncClient, auth_headers):
+    payload = [{"label": f"bulk{i}"} for i in range(3)]
+    res = await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+    keys = res.json()
+
+    # Warm the verified key cache
+    for item in keys:
+        await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": item["key"]})
+
+    return keys
+
+@pytest.mark.asyncio
+async def test_bulk_revoke_by_key_ids(client: AsyncClient, auth_headers, bulk_keys):
+    target = bulk_keys[:2]
+
+    response = await client.post(
+        "/api/v1/keys/bulk-revoke",
+        json={"key_ids": [item["key_id"] for item in target]},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200, f"Error:{response.text}"
+    assert sorted(response.json()["key_ids"]) == sorted(item["key_id"] for item in target)
+
+    # Cached keys are revoked immediately, the others keep working
+    for item in target:
+        res = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": item["key"]})
+        assert res.status_code == 403
+
+    res = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": bulk_keys[2]["key"]})
+    assert res.status_code == 200
+
+@pytest.mark.asyncio
+async def test_bulk_revoke_all(client: AsyncClient, auth_headers, bulk_keys):
+    response = await client.post("/api/v1/keys/bulk-revoke", json={"all": True}, headers=auth_headers)
+
+    assert response.status_code == 200, f"Error:{response.text}"
+    assert len(response.json()["key_ids"]) == 3
+
+    # Already revoked keys are not counted twice
+    response = await client.post("/api/v1/keys/bulk-revoke", json={"all": True}, headers=auth_headers)
+    assert response.json()["key_ids"] == []
+
+@pytest.mark.asyncio
+async def test_bulk_delete_by_labels(client: AsyncClient, auth_headers, bulk_keys):
+    response = await client.post(
+        "/api/v1/keys/bulk-delete",
+        json={"labels": ["bulk0", "bulk1"]},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200, f"Error:{response.text}"
+    assert len(response.json()["key_ids"]) == 2
+
+    res = await client.get("/api/v1/keys/protected-api", headers={"X-API-Key": bulk_keys[0]["key"]})
+    assert res.status_code == 401
+
+    keys = await client.get("/api/v1/keys/", headers=auth_headers)
+    assert [item["label"] for item in keys.json()] == ["bulk2"]
+
+@pytest.mark.asyncio
+async def test_bulk_selector_requires_one_criterion(client: AsyncClient, auth_headers):
+    response = await client.post(
+        "/api/v1/keys/bulk-delete",
+        json={"labels": ["bulk0"], "all": True},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 400, f"Error:{response.text}"
+    assert response.json()["detail"] == "Provide exactly one of key_ids, labels or all."
+
+
+# --- PAGINATION ---
+@pytest.mark.asyncio
+async def test_read_apikey_pages(client: AsyncClient, auth_headers):
+    payload = [{"label": f"page{i}"} for i in range(5)]
+    await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+
+    labels = []
+    params = {"limit": 2}
+
+    # Follow the cursor until the last page
+    while True:
+        response = await client.get("/api/v1/keys/", params=params, headers=auth_headers)
+        assert response.status_code == 200, f"Error:{response.text}"
+        labels += [item["label"] for item in response.json()]
+
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert labels == [item["label"] for item in payload]
+
+@pytest.mark.asyncio
+async def test_read_apikey_filters(client: AsyncClient, auth_headers):
+    payload = [{"label": "prod-a"}, {"label": "prod-b"}, {"label": "dev_a"}, {"label": "devXa"}]
+    await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+    await client.post("/api/v1/keys/bulk-revoke", json={"labels": ["prod-b"]}, headers=auth_headers)
+
+    prod = await client.get("/api/v1/keys/", params={"label_prefix": "prod-"}, headers=auth_headers)
+    assert [item["label"] for item in prod.json()] == ["prod-a", "prod-b"]
+
+    active_prod = await client.get("/api/v1/keys/", params={"label_prefix": "prod-", "is_active": True}, headers=auth_headers)
+    assert [item["label"] for item in active_prod.json()] == ["prod-a"]
+
+    # LIKE wildcards in the prefix are matched literally
+    dev = await client.get("/api/v1/keys/", params={"label_prefix": "dev_"}, headers=auth_headers)
+    assert [item["label"] for item in dev.json()] == ["dev_a"]
+
+# --- FAST RESPONSES ---
+@pytest.mark.asyncio
+async def test_fast_responses_match_validated_ones(client: AsyncClient, auth_headers, monkeypatch):
+    from app.core.config import settings
+
+    payload = [{"label": f"fast{i}", "description": "ü"} for i in range(3)]
+    await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+
+    paths = [("/api/v1/users/me", {}), ("/api/v1/keys/", {"limit": 2})]
+    validated = [await client.get(path, params=params, headers=auth_headers) for path, params in paths]
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = [await client.get(path, params=params, headers=auth_headers) for path, params in paths]
+
+    for slow_response, fast_response in zip(validated, fast):
+        assert fast_response.status_code == 200
+        assert fast_response.headers["content-type"] == "application/json"
+        assert fast_response.json() == slow_response.json()
+
+    assert fast[1].headers["X-Next-Cursor"] == validated[1].headers["X-Next-Cursor"]
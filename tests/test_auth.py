@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from app.core.security import SecurityUtils
+
 # ----------------------- MOCK DATA (FIXTURES) ----------------------- #
 # Sample Data
 user_data = {
@@ -179,6 +181,19 @@ async def test_register_duplicate_email(client: AsyncClient):
     assert response.status_code == 400, f"Error: {response.text}"
     assert response.json()["detail"] == "Email already registered"
 
+@pytest.mark.asyncio
+async def test_register_duplicate_email_case_insensitive(client: AsyncClient):
+    """Validation Check: Emails differing only in case are duplicates."""
+    await client.post("/api/v1/auth/register", json=user_data)
+
+    response = await client.post("/api/v1/auth/register", json={
+        **user_data_1,
+        "email": user_data_1["email"].upper(),
+    })
+
+    assert response.status_code == 400, f"Error: {response.text}"
+    assert response.json()["detail"] == "Email already registered"
+
 @pytest.mark.asyncio
 async def test_register_duplicate_username(client: AsyncClient):
     """Validation Check: Ensure username uniqueness."""
@@ -243,3 +258,166 @@ async def test_access_token_invalid(client: AsyncClient):
     # Verify status code
     assert response.status_code == 401, f"Error: {response.text}"
 
+
+# -------------------------PRINCIPAL CACHE-------------------------- #
+
+@pytest.mark.asyncio
+async def test_current_user_cached_and_invalidated(client: AsyncClient, session_factory):
+    """
+    Scenario: Repeated bearer calls are served from the principal cache,
+    and a change to the user row invalidates it.
+    """
+    from app.models.user import User
+    from app.core.cache import principal_cache
+
+    await client.post("/api/v1/auth/register", json=user_data)
+    log_res = await client.post("/api/v1/auth/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    headers = {"Authorization": f"Bearer {log_res.json()['access_token']}"}
+
+    first = await client.get("/api/v1/users/me", headers=headers)
+    hits_before = principal_cache.hits
+    second = await client.get("/api/v1/users/me", headers=headers)
+
+    assert second.json() == first.json()
+    assert principal_cache.hits == hits_before + 1
+
+    # Change the user row
+    async with session_factory() as session:
+        user = await session.get(User, first.json()["user_id"])
+        user.points = 42
+        await session.commit()
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+
+    assert response.json()["points"] == 42
+
+
+# --------------------------ARGON2 REHASH--------------------------- #
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password(client: AsyncClient, session_factory, monkeypatch):
+    """
+    Scenario: The Argon2 parameters changed since the user registered.
+    Expected: Login succeeds and the stored hash is upgraded after the response.
+    """
+    from passlib.context import CryptContext
+    from sqlalchemy import select
+    from app.models.user import User
+
+    old_context = CryptContext(schemes=["argon2"], argon2__time_cost=1, argon2__memory_cost=8192, argon2__parallelism=1)
+    new_context = CryptContext(schemes=["argon2"], argon2__time_cost=2, argon2__memory_cost=8192, argon2__parallelism=1)
+
+    monkeypatch.setattr(SecurityUtils, "pwd_context", old_context)
+    await client.post("/api/v1/auth/register", json=user_data)
+
+    monkeypatch.setattr(SecurityUtils, "pwd_context", new_context)
+    response = await client.post("/api/v1/auth/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+
+    assert response.status_code == 200
+
+    async with session_factory() as session:
+        stored = await session.scalar(select(User.password).where(User.username == user_data["username"]))
+
+    assert "t=2" in stored
+    assert not SecurityUtils.token_needs_update(stored)
+    assert SecurityUtils.verify_token(user_data["password"], stored)
+
+
+# --------------------------JWT CLAIMS CACHE------------------------ #
+
+@pytest.mark.asyncio
+async def test_jwt_claims_cached_until_key_changes(client: AsyncClient, monkeypatch):
+    """
+    Scenario: A bearer token is decoded once, then served from the claims cache
+    until SECRET_KEY changes.
+    """
+    from app.core.config import settings
+    from app.core.cache import jwt_claims_cache
+
+    await client.post("/api/v1/auth/register", json=user_data)
+    log_res = await client.post("/api/v1/auth/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    headers = {"Authorization": f"Bearer {log_res.json()['access_token']}"}
+
+    await client.get("/api/v1/users/me", headers=headers)
+    hits_before = jwt_claims_cache.hits
+    response = await client.get("/api/v1/users/me", headers=headers)
+
+    assert response.status_code == 200
+    assert jwt_claims_cache.hits == hits_before + 1
+
+    # Tokens signed with the old key must be rejected, cached or not
+    monkeypatch.setattr(settings, "SECRET_KEY", "rotated-secret-key")
+    response = await client.get("/api/v1/users/me", headers=headers)
+
+    assert response.status_code == 401
+    assert len(jwt_claims_cache) == 0
+
+def test_jwt_claims_expire_with_token():
+    """Unit Check: An entry lives no longer than its token's exp."""
+    import time
+    from app.core.cache import ClaimsCache
+
+    cache = ClaimsCache(maxsize=10, ttl=3600)
+
+    cache.get_claims("fresh", "fp")
+    cache.add("fresh", {"sub": "1", "exp": time.time() + 60}, "fp")
+    cache.add("expired", {"sub": "1", "exp": time.time() - 1}, "fp")
+
+    assert cache.get_claims("fresh", "fp")["sub"] == "1"
+    assert cache.get_claims("expired", "fp") is None
+    assert cache._data["fresh"][0] - time.monotonic() <= 60
+
+@pytest.mark.asyncio
+async def test_register_duplicate_username_containing_email(client: AsyncClient):
+    """Validation Check: The duplicate is reported by constraint, not by words in the error text."""
+    await client.post("/api/v1/auth/register", json={**user_data, "username": "emailfan1"})
+
+    response = await client.post("/api/v1/auth/register", json={**user_data_2, "username": "emailfan1"})
+
+    assert response.status_code == 400, f"Error: {response.text}"
+    assert response.json()["detail"] == "Username already registered"
+
+def test_violated_constraint_from_asyncpg():
+    """Unit Check: On PostgreSQL the constraint name comes from the chained asyncpg error."""
+    import asyncpg
+    from sqlalchemy.exc import IntegrityError
+    from app.db.errors import violated_constraint
+
+    cause = asyncpg.exceptions.UniqueViolationError("duplicate key value violates unique constraint")
+    cause.constraint_name = "ix_users_username"
+    adapted = Exception("DETAIL: Key (username)=(emailfan1) already exists.")
+    adapted.__cause__ = cause
+
+    assert violated_constraint(IntegrityError("INSERT", {}, adapted)) == "ix_users_username"
+
+@pytest.mark.asyncio
+async def test_delete_user_leaves_keys_to_database(client: AsyncClient, session_factory, query_counter):
+    """Query Check: Deleting a user neither loads nor deletes its keys one by one; ON DELETE CASCADE does."""
+    from app.models.user import User
+
+    res = await client.post("/api/v1/auth/register", json=user_data)
+    log_res = await client.post("/api/v1/auth/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    headers = {"Authorization": f"Bearer {log_res.json()['access_token']}"}
+    await client.post("/api/v1/keys/bulk-create", json=[{"label": "test01"}, {"label": "test02"}], headers=headers)
+
+    async with session_factory() as session:
+        user = await session.get(User, res.json()["user_id"])
+
+        query_counter.reset()
+        await session.delete(user)
+        await session.commit()
+
+    assert query_counter.count == 1
+    assert query_counter.statements[0].startswith("DELETE FROM users")
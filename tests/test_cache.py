@@ -0,0 +1,87 @@
+import time
+
+from app.core.cache import LRUTTLCache, VerifiedKeyCache, PrincipalCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a") # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+def test_ttl_expires_entries(monkeypatch):
+    cache = LRUTTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert cache.stats()["size"] == 0
+
+def test_verified_key_cache_invalidate_by_key_id():
+    cache = VerifiedKeyCache(maxsize=10, ttl=60)
+    digest = "a" * 64
+
+    cache.add(digest, {"key_id": 7, "is_active": True}, cache.version())
+    cache.invalidate(7)
+
+    assert cache.get(digest) is None
+    assert cache.invalidations == 1
+    assert cache.stats()["misses"] == 1
+
+def test_verified_key_cache_rejects_stale_lookup():
+    cache = VerifiedKeyCache(maxsize=10, ttl=60)
+    digest = "a" * 64
+
+    # A lookup reads the version, then the key is revoked before it caches
+    version = cache.version()
+    cache.invalidate(7)
+    cache.add(digest, {"key_id": 7, "is_active": True}, version)
+
+    assert cache.get(digest) is None
+
+    # Invalidations of other keys do not block it
+    version = cache.version()
+    cache.invalidate(8)
+    cache.add(digest, {"key_id": 7, "is_active": False}, version)
+
+    assert cache.get(digest)["is_active"] is False
+
+def test_verified_key_cache_prunes_invalidation_stamps():
+    cache = VerifiedKeyCache(maxsize=2, ttl=60)
+    digest = "a" * 64
+
+    stale = cache.version()
+    for key_id in range(10):
+        cache.invalidate(key_id)
+
+    assert len(cache._invalidated_at) == 2
+
+    # The stamp of key 7 was pruned, but the old lookup is still refused
+    cache.add(digest, {"key_id": 7, "is_active": True}, stale)
+    assert cache.get(digest) is None
+
+    cache.add(digest, {"key_id": 7, "is_active": True}, cache.version())
+    assert cache.get(digest) is not None
+
+def test_principal_cache_rejects_stale_version():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+
+    # A reader captures the version, then the row changes before it caches
+    version = cache.version(1)
+    cache.bump(1)
+    cache.add(1, version, {"user_id": 1, "points": 0})
+
+    assert cache.get_principal(1) is None
+
+    cache.add(1, cache.version(1), {"user_id": 1, "points": 10})
+    assert cache.get_principal(1)["points"] == 10
@@ -0,0 +1,105 @@
+import pytest
+from httpx import AsyncClient
+from jose import jwt
+
+from app.core.jwt_keys import KeyRing, generate_key, jwt_keyring
+
+user_data = {
+    "email": "test@example.com",
+    "username": "testuser",
+    "password": "password123"
+}
+
+@pytest.fixture
+def keys_dir(tmp_path):
+    """
+    Keyring with one ES256 key (kid "k1"), emptied again after the test.
+    """
+    generate_key(str(tmp_path), "k1")
+    jwt_keyring.load(str(tmp_path))
+    yield tmp_path
+    jwt_keyring.load(None)
+
+async def login(client: AsyncClient) -> str:
+    await client.post("/api/v1/auth/register", json=user_data)
+    response = await client.post("/api/v1/auth/login", json={
+        "username": user_data["username"],
+        "password": user_data["password"]
+    })
+    return response.json()["access_token"]
+
+@pytest.mark.asyncio
+async def test_es256_token_verifies_with_jwks(client: AsyncClient, keys_dir):
+    """
+    Scenario: With a keyring, tokens are ES256 with a kid header, and anyone
+    holding the published JWKS can verify them.
+    """
+    token = await login(client)
+
+    assert jwt.get_unverified_header(token) == {"alg": "ES256", "typ": "JWT", "kid": "k1"}
+
+    response = await client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+    jwks = (await client.get("/.well-known/jwks.json")).json()
+    claims = jwt.decode(token, jwks, algorithms=["ES256"])
+
+    assert claims["sub"] == str(response.json()["user_id"])
+    assert "d" not in jwks["keys"][0]
+
+@pytest.mark.asyncio
+async def test_rotation_keeps_old_tokens_until_key_removed(client: AsyncClient, keys_dir):
+    """
+    Scenario: A new signing key is activated; tokens of the old key stay valid
+    until its file is removed.
+    """
+    old_token = await login(client)
+    headers = {"Authorization": f"Bearer {old_token}"}
+
+    generate_key(str(keys_dir), "k2")
+    jwt_keyring.load(str(keys_dir), "k2")
+
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+
+    new_token = await login(client)
+    assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+
+    (keys_dir / "k1.pem").unlink()
+    jwt_keyring.load(str(keys_dir), "k2")
+
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 401
+
+@pytest.mark.asyncio
+async def test_jwks_etag(client: AsyncClient, keys_dir):
+    """Caching Check: The JWKS carries an ETag and Cache-Control, and a matching If-None-Match gets a 304."""
+    response = await client.get("/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/jwk-set+json"
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    etag = response.headers["etag"]
+    cached = await client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    generate_key(str(keys_dir), "k2")
+    jwt_keyring.load(str(keys_dir))
+    changed = await client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert len(changed.json()["keys"]) == 2
+
+def test_keyring_rejects_other_curves(tmp_path):
+    """Validation Check: Only P-256 keys are loaded."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    pem = ec.generate_private_key(ec.SECP384R1()).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    )
+    (tmp_path / "p384.pem").write_bytes(pem)
+
+    with pytest.raises(ValueError):
+        KeyRing().load(str(tmp_path))
@@ -0,0 +1,151 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+from app.db.session import InstrumentedQueuePool
+
+ADMIN_TOKEN = "metrics-admin-token"
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", ADMIN_TOKEN)
+    return {"X-Admin-Token": ADMIN_TOKEN}
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(5)
+
+    snapshot = histogram.snapshot()
+
+    assert [bucket["count"] for bucket in snapshot["buckets"]] == [2, 2, 3]
+    assert snapshot["buckets"][-1]["le"] == "+Inf"
+    assert snapshot["count"] == 3
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_checkouts():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=InstrumentedQueuePool)
+    checkouts_before = InstrumentedQueuePool.checkouts
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    await engine.dispose()
+
+    assert InstrumentedQueuePool.checkouts == checkouts_before + 1
+    assert InstrumentedQueuePool.wait_seconds.count >= 1
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(client: AsyncClient, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", "test-admin-token")
+
+    # Telemetry is not served without the admin token
+    for path in ("/api/v1/internal/pool", "/api/v1/internal/cache"):
+        assert (await client.get(path)).status_code == 401
+
+    response = await client.get("/api/v1/internal/pool", headers={"X-Admin-Token": "test-admin-token"})
+
+    assert response.status_code == 200, f"Error: {response.text}"
+
+    data = response.json()
+    assert {"size", "checked_out", "overflow", "wait_seconds"} <= data.keys()
+
+def test_registry_renders_exposition_format():
+    from app.core.metrics import MetricsRegistry, Counter, HistogramVec
+
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("demo_total", "Demo counter.", ("route",)))
+    histogram = registry.register(HistogramVec("demo_seconds", "Demo histogram.", buckets=(0.1,)))
+
+    counter.labels('/a"b').inc()
+    histogram.observe(0.05)
+
+    text = registry.render()
+
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{route="/a\\"b"} 1.0' in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 1' in text
+    assert "demo_seconds_count 1" in text
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_uses_route_templates(client: AsyncClient, admin_headers):
+    await client.patch("/api/v1/keys/update/12345", json={})
+
+    response = await client.get("/metrics", headers=admin_headers)
+
+    assert response.status_code == 200, f"Error: {response.text}"
+    assert response.headers["content-type"].startswith("text/plain")
+
+    text = response.text
+    assert 'route="/api/v1/keys/update/{key_id}"' in text
+    assert "/api/v1/keys/update/12345" not in text
+    assert "db_query_duration_seconds_count" in text
+    assert 'cache_lookups_total{cache="verified_keys",result="hits"}' in text
+
+@pytest.mark.asyncio
+async def test_metrics_collapse_unknown_methods(client: AsyncClient, admin_headers):
+    await client.request("FOOBAR", "/no-such-route")
+
+    text = (await client.get("/metrics", headers=admin_headers)).text
+
+    assert 'method="FOOBAR"' not in text
+    assert 'method="OTHER",route="<unmatched>"' in text
+
+
+# ------------------------- ACCESS LOG ------------------------- #
+class _Capture:
+    def __init__(self):
+        self.records = []
+
+    def handle(self, record):
+        self.records.append(record)
+
+@pytest.fixture
+def access_records():
+    import logging
+    from app.core.access_log import access_logger
+
+    capture = _Capture()
+    handler = logging.Handler()
+    handler.emit = capture.handle
+    access_logger.addHandler(handler)
+    yield capture.records
+    access_logger.removeHandler(handler)
+
+@pytest.mark.asyncio
+async def test_access_log_structured_record(client: AsyncClient, access_records):
+    response = await client.get("/api/v1/keys/update/1")
+
+    assert "X-Process-Time" in response.headers
+
+    record = access_records[-1].msg
+    assert record["method"] == "GET"
+    assert record["path"] == "/api/v1/keys/update/1"
+    assert record["status"] == response.status_code
+    assert "duration_ms" in record
+
+@pytest.mark.asyncio
+async def test_access_log_sampling_keeps_errors(client: AsyncClient, access_records, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+
+    await client.get("/")
+    assert access_records == []
+
+    await client.get("/api/v1/users/me")
+    assert [record.msg["status"] for record in access_records] == [401]
+
+@pytest.mark.asyncio
+async def test_metrics_requires_admin_token(client: AsyncClient, admin_headers):
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/metrics", headers={"X-Admin-Token": "wrong"})).status_code == 401
@@ -0,0 +1,154 @@
+import pytest
+from httpx import AsyncClient
+
+# Regression guard: number of SQL statements each endpoint sends to the database.
+# Bearer requests are made after a warm-up call so the cached principal is used.
+
+user_data = {
+    "email": "test@example.com",
+    "username": "tester01",
+    "password": "password123",
+}
+
+login_data = {
+    "username": user_data["username"],
+    "password": user_data["password"],
+}
+
+@pytest.fixture
+async def auth_headers(client: AsyncClient):
+    await client.post("/api/v1/auth/register", json=user_data)
+    login_res = await client.post("/api/v1/auth/login", json=login_data)
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+
+    # Warm the principal cache
+    await client.get("/api/v1/users/me", headers=headers)
+
+    return headers
+
+@pytest.fixture
+async def apikey(client: AsyncClient, auth_headers):
+    res = await client.post("/api/v1/keys/create", json={"label": "test01"}, headers=auth_headers)
+    return res.json()
+
+
+@pytest.mark.asyncio
+async def test_register_query_count(client: AsyncClient, query_counter):
+    await client.post("/api/v1/auth/register", json=user_data)
+
+    # INSERT ... RETURNING
+    assert query_counter.count == 1, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_login_query_count(client: AsyncClient, query_counter):
+    await client.post("/api/v1/auth/register", json=user_data)
+    query_counter.reset()
+
+    response = await client.post("/api/v1/auth/login", json=login_data)
+
+    assert response.status_code == 200
+    assert query_counter.count == 1, query_counter.statements
+    assert "apikeys" not in query_counter.statements[0]
+
+@pytest.mark.asyncio
+async def test_users_me_query_count(client: AsyncClient, query_counter):
+    await client.post("/api/v1/auth/register", json=user_data)
+    login_res = await client.post("/api/v1/auth/login", json=login_data)
+    headers = {"Authorization": f"Bearer {login_res.json()['access_token']}"}
+    query_counter.reset()
+
+    # First call loads the user without its keys, the next one is cached
+    await client.get("/api/v1/users/me", headers=headers)
+    assert query_counter.count == 1, query_counter.statements
+
+    await client.get("/api/v1/users/me", headers=headers)
+    assert query_counter.count == 1, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_create_apikey_query_count(client: AsyncClient, auth_headers, query_counter):
+    await client.post("/api/v1/keys/create", json={"label": "test01"}, headers=auth_headers)
+
+    # Label check, INSERT, refresh
+    assert query_counter.count == 3, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_bulk_create_apikeys_query_count(client: AsyncClient, auth_headers, query_counter):
+    payload = [{"label": f"bulk{i}"} for i in range(20)]
+    response = await client.post("/api/v1/keys/bulk-create", json=payload, headers=auth_headers)
+
+    # One label check, one multi-row INSERT ... RETURNING
+    assert response.status_code == 201
+    assert query_counter.count == 2, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_read_apikey_query_count(client: AsyncClient, auth_headers, apikey, query_counter):
+    await client.get("/api/v1/keys/", headers=auth_headers)
+
+    assert query_counter.count == 1, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_update_apikey_query_count(client: AsyncClient, auth_headers, apikey, query_counter):
+    await client.patch(
+        f"/api/v1/keys/update/{apikey['key_id']}",
+        json={"label": "changed", "is_active": False},
+        headers=auth_headers
+    )
+
+    # One conditional UPDATE ... RETURNING
+    assert query_counter.count == 1, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_update_apikey_errors_query_count(client: AsyncClient, auth_headers, apikey, query_counter):
+    # Redundant status: the UPDATE matches nothing, one extra SELECT explains why
+    response = await client.patch(
+        f"/api/v1/keys/update/{apikey['key_id']}",
+        json={"is_active": True},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 400
+    assert query_counter.count == 2, query_counter.statements
+
+    # Duplicate label: rejected by the unique constraint
+    await client.post("/api/v1/keys/create", json={"label": "test02"}, headers=auth_headers)
+    query_counter.reset()
+
+    response = await client.patch(
+        f"/api/v1/keys/update/{apikey['key_id']}",
+        json={"label": "test02"},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 400
+    assert query_counter.count == 1, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_delete_apikey_query_count(client: AsyncClient, auth_headers, apikey, query_counter):
+    await client.delete("/api/v1/keys/delete", params={"label": "test01"}, headers=auth_headers)
+
+    assert query_counter.count == 2, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_bulk_revoke_and_delete_query_count(client: AsyncClient, auth_headers, apikey, query_counter):
+    await client.post("/api/v1/keys/bulk-revoke", json={"all": True}, headers=auth_headers)
+    assert query_counter.count == 1, query_counter.statements
+
+    await client.post("/api/v1/keys/bulk-delete", json={"all": True}, headers=auth_headers)
+    assert query_counter.count == 2, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_roll_apikey_query_count(client: AsyncClient, auth_headers, apikey, query_counter):
+    await client.post(f"/api/v1/keys/roll/{apikey['key_id']}", headers=auth_headers)
+
+    assert query_counter.count == 2, query_counter.statements
+
+@pytest.mark.asyncio
+async def test_protected_api_query_count(client: AsyncClient, apikey, query_counter):
+    header = {"X-API-Key": apikey["key"]}
+
+    # First call resolves the key by lookup id, the next one is cached
+    await client.get("/api/v1/keys/protected-api", headers=header)
+    assert query_counter.count == 1, query_counter.statements
+
+    await client.get("/api/v1/keys/protected-api", headers=header)
+    assert query_counter.count == 1, query_counter.statements
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.ratelimit import InMemoryRateLimitStore, load_store, login_limiter
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_rejects_over_limit():
+    store = InMemoryRateLimitStore()
+
+    results = [await store.hit("k", limit=3, window=60) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
+    assert 0 < results[3].retry_after <= 120
+
+@pytest.mark.asyncio
+async def test_store_memory_is_bounded():
+    store = InMemoryRateLimitStore(shards=1, max_keys_per_shard=2)
+
+    for i in range(5):
+        await store.hit(f"k{i}", limit=1, window=60)
+
+    assert len(store) == 2
+    assert store.evictions == 3
+
+@pytest.mark.asyncio
+async def test_expired_windows_are_swept():
+    store = InMemoryRateLimitStore(shards=1)
+
+    await store.hit("old", limit=1, window=0.01)
+    await asyncio.sleep(0.03)
+    await store.hit("new", limit=1, window=60)
+
+    assert len(store) == 1
+
+def test_load_store_rejects_other_classes():
+    with pytest.raises(TypeError):
+        load_store("collections.OrderedDict")
+
+@pytest.mark.asyncio
+async def test_login_throttled_before_db(client: AsyncClient, query_counter):
+    login = {"username": "victim01", "password": "wrongpass1"}
+
+    for _ in range(login_limiter.per_username):
+        response = await client.post("/api/v1/auth/login", json=login)
+        assert response.status_code == 401
+
+    query_counter.reset()
+    response = await client.post("/api/v1/auth/login", json=login)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert query_counter.count == 0
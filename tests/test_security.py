@@ -0,0 +1,54 @@
+import pytest
+
+from app.core.security import SecurityUtils
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_async_roundtrip():
+    hashed = await SecurityUtils.get_hashed_token_async("password123")
+
+    assert await SecurityUtils.verify_token_async("password123", hashed) is True
+    assert await SecurityUtils.verify_token_async("password456", hashed) is False
+
+
+def test_api_key_format_roundtrip():
+    key, lookup_id = SecurityUtils.create_api_key("test")
+
+    parsed = SecurityUtils.parse_api_key(key)
+
+    assert key.startswith("sk_test_v2_")
+    assert parsed.version == 2
+    assert parsed.lookup_id == lookup_id
+
+def test_api_key_typo_fails_checksum():
+    key, _ = SecurityUtils.create_api_key("live")
+
+    # Change one character of the secret part
+    index = 40
+    typo = key[:index] + ("A" if key[index] != "A" else "B") + key[index + 1:]
+
+    assert SecurityUtils.parse_api_key(typo) is None
+    assert SecurityUtils.parse_api_key(key[:-1]) is None
+
+def test_api_key_legacy_format_accepted():
+    legacy_key = f"sk_live_{SecurityUtils.create_api_token()}"
+
+    parsed = SecurityUtils.parse_api_key(legacy_key)
+
+    assert parsed.version == 1
+    assert parsed.lookup_id is None
+
+def test_update_env_file_replaces_and_appends(tmp_path):
+    from app.core.calibrate import update_env_file
+
+    env_file = tmp_path / ".env"
+    env_file.write_text("SECRET_KEY=abc\nARGON2_TIME_COST=2\n")
+
+    update_env_file(str(env_file), {"ARGON2_TIME_COST": 4, "ARGON2_MEMORY_COST": 65536})
+
+    lines = env_file.read_text().splitlines()
+
+    assert "SECRET_KEY=abc" in lines
+    assert "ARGON2_TIME_COST=4" in lines
+    assert "ARGON2_TIME_COST=2" not in lines
+    assert "ARGON2_MEMORY_COST=65536" in lines